@@ -0,0 +1,451 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import contextlib
+import copy
+import datetime
+import gc
+import json
+import multiprocessing as mp
+import os
+from pathlib import Path
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from xml.etree import ElementTree
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+for _dirname in ["python/01_italable_class", "python/02_n-th_string", "python/03_egov"]:
+    sys.path.append(str(ROOT / _dirname))
+from iter_advanced import Series, show_enabled  # noqa: E402
+from law_all import LawLoader  # noqa: E402
+from law_bench import peak_rss  # noqa: E402
+from law_cache import DiskCache  # noqa: E402
+from law_parse import iter_law_list, iter_law_texts  # noqa: E402
+from law_preprocess import pre_process  # noqa: E402
+from ordinal_func import int2ordinal, ints2ordinals  # noqa: E402
+
+
+def _scale_law_list(filename, n):
+    """
+    Create lawlists XML data with @n laws, repeating the laws of the fixture.
+
+    Args:
+        filename (str): filename to save
+        n (int): the number of laws
+
+    Notes:
+        Names and numbers of the repeated laws have suffixes, like "日本国憲法1", so that they will be unique.
+    """
+    tree = ElementTree.parse(FIXTURE_DIR / "lawlists.xml")
+    parent = tree.getroot().find("ApplData")
+    laws = parent.findall("LawNameListInfo")
+    for law in laws:
+        parent.remove(law)
+    for i in range(n):
+        (q, mod) = divmod(i, len(laws))
+        law = copy.deepcopy(laws[mod])
+        if q:
+            law.find("LawName").text += str(q)
+            law.find("LawNo").text += str(q)
+        parent.append(law)
+    tree.write(filename, encoding="UTF-8", xml_declaration=True)
+
+
+def _scale_law_data(filename, n):
+    """
+    Create lawdata XML data with @n articles in the main provision, repeating the articles of the fixture.
+
+    Args:
+        filename (str): filename to save
+        n (int): the number of articles
+    """
+    tree = ElementTree.parse(FIXTURE_DIR / "lawdata.xml")
+    parent = tree.getroot().find(".//MainProvision")
+    articles = list(parent.iter("Article"))
+    for chapter in list(parent):
+        parent.remove(chapter)
+    for i in range(n):
+        parent.append(copy.deepcopy(articles[i % len(articles)]))
+    tree.write(filename, encoding="UTF-8", xml_declaration=True)
+
+
+# Cases: setup(size, work_dir) returns the state and run(state) will be measured
+def setup_law_list(size, work_dir):
+    filename = os.path.join(work_dir, f"lawlists_{size}.xml")
+    if not os.path.exists(filename):
+        _scale_law_list(filename, size)
+    return filename
+
+
+def run_law_list_tree(filename):
+    with open(filename, "rb") as fh:
+        root = ElementTree.fromstring(fh.read().decode(encoding="utf-8"))
+    names = [e.text for e in root.iter() if e.tag == "LawName"]
+    numbers = [e.text for e in root.iter() if e.tag == "LawNo"]
+    return {name: num for (name, num) in zip(names, numbers)}
+
+
+def run_law_list_stream(filename):
+    with open(filename, "rb") as fh:
+        return dict(iter_law_list(fh))
+
+
+def setup_law_data(size, work_dir):
+    filename = os.path.join(work_dir, f"lawdata_{size}.xml")
+    if not os.path.exists(filename):
+        _scale_law_data(filename, size)
+    return filename
+
+
+def run_law_data_tree(filename):
+    with open(filename, "rb") as fh:
+        root = ElementTree.fromstring(fh.read().decode(encoding="utf-8"))
+    return LawLoader._parse_raw(root)
+
+
+def run_law_data_stream(filename):
+    with open(filename, "rb") as fh:
+        return list(iter_law_texts(fh))
+
+
+def setup_pre_process(size, work_dir):
+    return run_law_data_stream(setup_law_data(size, work_dir))
+
+
+def run_pre_process(raw):
+    return pre_process(raw)
+
+
+def setup_law_number(size, work_dir, n_keywords=1000, seed=0):
+    filename = setup_law_list(size, work_dir)
+    cache = DiskCache(path=os.path.join(work_dir, f"egov_cache_{size}.sqlite3"), ttl=float("inf"))
+    with open(filename, "rb") as fh:
+        cache.store(f"{LawLoader.API_URL}/lawlists/1", fh.read())
+    # The lawlists will be read from the cache without network access
+    loader = LawLoader(category=1, cache=cache)
+    rand = random.Random(seed)
+    names = sorted(loader.law_dict)
+    keywords = []
+    for _ in range(n_keywords):
+        name = rand.choice(names)
+        start = rand.randrange(len(name))
+        keywords.append(name[start: start + rand.randint(1, 8)])
+    return (loader, keywords)
+
+
+def run_law_number(state):
+    (loader, keywords) = state
+    return [loader.get_law_number(keyword) for keyword in keywords]
+
+
+def setup_series(size, work_dir):
+    series = Series()
+    series.extend(range(size))
+    return series
+
+
+def run_series_build(size):
+    series = Series()
+    series.extend(range(size))
+    return series
+
+
+def run_series_states(series):
+    series.enable(slice(None))
+    series.disable(slice(None, None, 2))
+    series.enable(lambda values: values % 4 == 0)
+    series.disable(list(range(0, len(series), 3)))
+    return (series.n_enabled, series.enabled_sum, len(series.enabled_indices()))
+
+
+def run_show_enabled(series):
+    with open(os.devnull, "w") as fh, contextlib.redirect_stdout(fh):
+        show_enabled(series)
+
+
+def setup_ordinal(size, work_dir, high=1000, seed=0):
+    return np.random.default_rng(seed).integers(0, high, size).tolist()
+
+
+def run_int2ordinal(nums):
+    return [int2ordinal(num) for num in nums]
+
+
+def run_ints2ordinals(nums):
+    return ints2ordinals(nums)
+
+
+def setup_covsirphy(size, work_dir):
+    import covsirphy as cs
+    return cs
+
+
+def run_covsirphy(cs, population=126_500_000):
+    # Records (bundled data of Japan, without downloading datasets)
+    country_data = cs.CountryData(str(ROOT / "covsirphy" / "04_trend" / "input" / "covid_jpn_total.csv"), "Japan")
+    country_data.set_variables(
+        date="Date", confirmed="Positive", fatal="Fatal", recovered="Discharged", province=None)
+    jhu_data = cs.JHUData.from_dataframe(country_data.cleaned())
+    population_data = cs.PopulationData(filename=None)
+    population_data.update(population, country="Japan")
+    snl = cs.Scenario(jhu_data, population_data, country="Japan")
+    # S-R trend analysis
+    snl.trend(show_figure=False)
+    # Parameter estimation
+    snl.estimate(cs.SIRF, n_jobs=1, timeout=20, timeout_iteration=2, seed=0, stdout=False)
+    return snl.summary()
+
+
+# {name: (setup, run, sizes, the number of repeats or None (default), description)}
+CASES = {
+    "egov.lawlists.tree": (
+        setup_law_list, run_law_list_tree, [10 ** 4, 10 ** 5], None,
+        "LawLoader: lawlists with ElementTree.fromstring()"),
+    "egov.lawlists.stream": (
+        setup_law_list, run_law_list_stream, [10 ** 4, 10 ** 5], None,
+        "LawLoader(stream=True): lawlists with iterparse"),
+    "egov.lawdata.tree": (
+        setup_law_data, run_law_data_tree, [10 ** 3, 10 ** 4], None,
+        "LawLoader: lawdata with ElementTree.fromstring()"),
+    "egov.lawdata.stream": (
+        setup_law_data, run_law_data_stream, [10 ** 3, 10 ** 4], None,
+        "LawLoader(stream=True): lawdata with iterparse"),
+    "egov.pre_process": (
+        setup_pre_process, run_pre_process, [10 ** 3, 10 ** 4], None,
+        "pre_process() of raw contents"),
+    "egov.get_law_number": (
+        setup_law_number, run_law_number, [10 ** 4, 10 ** 5], None,
+        "LawLoader.get_law_number() with 1000 keywords"),
+    "series.build": (
+        lambda size, work_dir: size, run_series_build, [10 ** 3, 10 ** 5, 10 ** 7], None,
+        "Series.extend()"),
+    "series.enable_disable": (
+        setup_series, run_series_states, [10 ** 3, 10 ** 5, 10 ** 7], None,
+        "Series.enable()/disable() with slice, callable and index numbers"),
+    "series.show_enabled": (
+        setup_series, run_show_enabled, [10 ** 3, 10 ** 5, 10 ** 7], None,
+        "show_enabled() to os.devnull"),
+    "ordinal.int2ordinal": (
+        setup_ordinal, run_int2ordinal, [10 ** 6], None,
+        "int2ordinal() for each value"),
+    "ordinal.ints2ordinals": (
+        setup_ordinal, run_ints2ordinals, [10 ** 6], None,
+        "ints2ordinals() at once"),
+    "covsirphy.pipeline": (
+        setup_covsirphy, run_covsirphy, [None], 1,
+        "Scenario of Japan: records, trend and estimate (SIR-F)"),
+}
+
+
+def _measure(name, size, repeat, work_dir, queue):
+    """
+    Measure a case in a child process.
+
+    Args:
+        name (str): name of the case
+        size (int or None): size of the case
+        repeat (int): the number of runs
+        work_dir (str): directory to save temporary files
+        queue (multiprocessing.Queue): queue to return the result (dict) or an exception
+    """
+    (setup, run) = CASES[name][:2]
+    try:
+        state = setup(size, work_dir)
+        times = []
+        gc.collect()
+        base = peak_rss()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = run(state)
+            times.append(time.perf_counter() - start)
+            del result
+        rss = peak_rss() - base
+        # Run once more to trace allocations because tracemalloc slows down the runs
+        tracemalloc.start()
+        result = run(state)
+        (_, traced) = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+    except ImportError as e:
+        queue.put({"skipped": str(e)})
+        return
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+        return
+    queue.put({
+        "time_best": min(times),
+        "time_median": statistics.median(times),
+        "repeat": repeat,
+        "traced_peak_mib": traced / 1024 ** 2,
+        "rss_peak_increase_mib": rss,
+    })
+
+
+def measure(name, size, repeat, work_dir):
+    """
+    Measure a case in a new process so that the peak memory is not affected by the other cases.
+
+    Args:
+        name (str): name of the case
+        size (int or None): size of the case
+        repeat (int): the number of runs
+        work_dir (str): directory to save temporary files
+
+    Returns:
+        dict(str, object): the result
+            - time_best (float): the shortest runtime [sec]
+            - time_median (float): median of runtime [sec]
+            - repeat (int): the number of runs
+            - traced_peak_mib (float): peak memory [MiB] allocated in a run, traced with tracemalloc
+            - rss_peak_increase_mib (float): increase of peak RSS [MiB] with the runs
+            or "skipped"/"error" (str) when the case could not be measured
+    """
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_measure, args=(name, size, repeat, work_dir, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def environment():
+    """
+    Return the information of the environment.
+
+    Returns:
+        dict(str, object): date, git commit, Python version, platform and CPU count
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def load_history(filename):
+    """
+    Load the history of benchmark runs.
+
+    Args:
+        filename (str or pathlib.Path): JSON file of the history
+
+    Returns:
+        list[dict(str, object)]: the runs, the same as the returned value of run_suite()
+    """
+    if not os.path.exists(filename):
+        return []
+    with open(filename, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def run_suite(names=None, max_size=None, repeat=3, verbose=True):
+    """
+    Run the benchmark cases.
+
+    Args:
+        names (list[str] or None): names of the cases, or None (all cases)
+        max_size (int or None): cases larger than this size will be skipped, or None (not skipped)
+        repeat (int): the number of runs of each case, if not specified with the case
+        verbose (bool): whether show the progress or not
+
+    Raises:
+        KeyError: un-registered cases were selected
+
+    Returns:
+        dict(str, object): environment() and "results" (list[dict(str, object)]: case, size and measure())
+    """
+    names = list(CASES) if names is None else names
+    unknown = set(names) - set(CASES)
+    if unknown:
+        raise KeyError(f"Un-registered cases were selected: {', '.join(sorted(unknown))}. Please use {', '.join(CASES)}.")
+    run_dict = environment()
+    results = []
+    work_dir = tempfile.mkdtemp(prefix="bench_")
+    try:
+        for name in names:
+            (_, _, sizes, case_repeat, _) = CASES[name]
+            for size in sizes:
+                if max_size is not None and size is not None and size > max_size:
+                    continue
+                result = {"case": name, "size": size, **measure(name, size, case_repeat or repeat, work_dir)}
+                results.append(result)
+                if verbose:
+                    status = result.get("skipped") or result.get("error") or f"{result['time_best']:.4f} sec"
+                    print(f"{name} ({size}): {status}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    run_dict["results"] = results
+    return run_dict
+
+
+def compare(run_dict, previous):
+    """
+    Return a markdown table to compare a run with the previous run.
+
+    Args:
+        run_dict (dict(str, object)): the run, the returned value of run_suite()
+        previous (dict(str, object) or None): the previous run, or None (not compared)
+
+    Returns:
+        str: markdown table
+    """
+    previous_dict = {}
+    if previous is not None:
+        previous_dict = {
+            (result["case"], result["size"]): result for result in previous["results"] if "time_best" in result}
+    lines = [
+        "| case | size | time [sec] | ratio | traced peak [MiB] | peak RSS increase [MiB] |",
+        "|:--|--:|--:|--:|--:|--:|",
+    ]
+    for result in run_dict["results"]:
+        if "time_best" not in result:
+            status = "skipped" if "skipped" in result else "error"
+            lines.append(f"| {result['case']} | {result['size']} | {status} | - | - | - |")
+            continue
+        before = previous_dict.get((result["case"], result["size"]))
+        ratio = "-" if before is None else f"{result['time_best'] / before['time_best']:.2f}"
+        lines.append(
+            f"| {result['case']} | {result['size']} | {result['time_best']:.4f} | {ratio} "
+            f"| {result['traced_peak_mib']:.1f} | {result['rss_peak_increase_mib']:.1f} |")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run benchmarks without network access.")
+    parser.add_argument("cases", nargs="*", help=f"names of the cases (default: all), {', '.join(CASES)}")
+    parser.add_argument("--max-size", type=int, default=None, help="skip the cases larger than this size")
+    parser.add_argument("--repeat", type=int, default=3, help="the number of runs of each case")
+    parser.add_argument(
+        "--history", default=str(Path(__file__).resolve().parent / "history.json"),
+        help="JSON file to append the results")
+    args = parser.parse_args()
+    run_dict = run_suite(names=args.cases or None, max_size=args.max_size, repeat=args.repeat)
+    history = load_history(args.history)
+    print(f"\ncommit: {run_dict['commit']}, previous: {history[-1]['commit'] if history else None}")
+    print(compare(run_dict, history[-1] if history else None))
+    history.append(run_dict)
+    with open(args.history, "w", encoding="utf-8") as fh:
+        json.dump(history, fh, indent=4)
+
+
+if __name__ == "__main__":
+    main()
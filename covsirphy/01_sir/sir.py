@@ -1,8 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+from pathlib import Path
 from pprint import pprint
+import sys
+import pandas as pd
 import covsirphy as cs
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from toolkit import simulate_batch  # noqa: E402
 
 
 def main():
@@ -32,6 +37,10 @@ def main():
         y_integer=True,
         filename="sir.png"
     )
+    # Records with many sets of parameter values at once
+    params = pd.DataFrame({"population": 1_000_000, "rho": [0.2, 0.4], "sigma": [0.075, 0.0150]})
+    batch_df = simulate_batch(model, params, tau=1440, start_date="01Jan2020", country=area["country"])
+    print(batch_df.groupby("Province").tail(1))
 
 
 if __name__ == "__main__":
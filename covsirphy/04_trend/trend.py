@@ -1,13 +1,17 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+from pathlib import Path
+import sys
 import covsirphy as cs
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from toolkit import CachedDataLoader, EstimationCache  # noqa: E402
 
 
 def main():
     print(cs.__version__)
     # Data loading
-    data_loader = cs.DataLoader("input")
+    data_loader = CachedDataLoader("input")
     jhu_data = data_loader.jhu(verbose=True)
     population_data = data_loader.population(verbose=True)
     # For Japan
@@ -25,8 +29,8 @@ def main():
     # Summary
     with open("summary.md", "w") as fh:
         fh.write(snl.summary().to_markdown())
-    # Phase-dependent Rt
-    snl.estimate(cs.SIRF)
+    # Phase-dependent Rt (the phases estimated with the previous runs will be restored)
+    EstimationCache("input/cache/estimation").estimate(snl, cs.SIRF)
     snl.history(target="Rt", filename="rt.jpg")
 
 
@@ -1,13 +1,19 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+from pathlib import Path
+import sys
 import covsirphy as cs
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from toolkit import CachedDataLoader, EstimationCache, Instrument, Report  # noqa: E402
 
 
 def main():
     print(cs.__version__)
+    # Stages will be recorded when COVSIRPHY_METRICS_DIR is set
+    instrument = Instrument.from_env("estimate", labels={"country": "Japan"})
     # Data loading
-    data_loader = cs.DataLoader("input")
+    data_loader = instrument.wrap(CachedDataLoader("input"), ["jhu", "population", "japan"])
     jhu_data = data_loader.jhu(verbose=True)
     population_data = data_loader.population(verbose=True)
     # For Japan
@@ -15,41 +21,38 @@ def main():
     jhu_data.replace(japan_data)
     print(japan_data.citation)
     # Records
-    snl = cs.Scenario(jhu_data, population_data, country="Japan")
+    snl = instrument.call("scenario", cs.Scenario, jhu_data, population_data, country="Japan")
+    instrument.wrap(snl, ["records", "trend", "estimate", "history", "track"])
     snl.records(filename="records.jpg")
     # S-R trend analysis
     snl.trend(filename="trend.jpg")
     # Summary
     with open("summary.md", "w") as fh:
         fh.write(snl.summary().to_markdown())
-    # Parameter estimation
-    snl.estimate(cs.SIRF)
-    with open("summary_estimated.md", "w") as fh:
-        fh.write(snl.summary().to_markdown())
+    # Parameter estimation (the phases estimated with the previous runs will be restored)
+    cache = EstimationCache("input/cache/estimation")
+    instrument.call("estimate", cache.estimate, snl, cs.SIRF)
+    report = Report(snl)
+    report.table("summary_estimated.md")
     # Parameters
-    with open("summary_param.md", "w") as fh:
-        cols = ["Start", "End", "ODE", "tau", *cs.SIRF.PARAMETERS]
-        fh.write(snl.summary(columns=cols).to_markdown())
-    snl.history(target="theta", filename="theta.jpg")
-    snl.history(target="kappa", filename="kappa.jpg")
-    snl.history(target="rho", filename="rho.jpg")
-    snl.history(target="sigma", filename="sigma.jpg")
+    report.table("summary_param.md", columns=["Start", "End", "ODE", "tau", *cs.SIRF.PARAMETERS])
+    report.history("theta", "theta.jpg")
+    report.history("kappa", "kappa.jpg")
+    report.history("rho", "rho.jpg")
+    report.history("sigma", "sigma.jpg")
     # Day-parameters
-    with open("summary_param_day.md", "w") as fh:
-        cols = ["Start", "End", "ODE", "tau", *cs.SIRF.DAY_PARAMETERS]
-        fh.write(snl.summary(columns=cols).to_markdown())
-    snl.history(target="1/beta [day]", filename="beta.jpg")
+    report.table("summary_param_day.md", columns=["Start", "End", "ODE", "tau", *cs.SIRF.DAY_PARAMETERS])
+    report.history("1/beta [day]", "beta.jpg")
     # Rt
-    with open("summary_rt.md", "w") as fh:
-        cols = ["Start", "End", "ODE", "Rt"]
-        fh.write(snl.summary(columns=cols).to_markdown())
-    snl.history(target="Rt", filename="rt.jpg")
+    report.table("summary_rt.md", columns=["Start", "End", "ODE", "Rt"])
+    report.history("Rt", "rt.jpg")
     # Accuracy
-    with open("summary_accuracy.md", "w") as fh:
-        cols = ["Start", "End", "RMSLE", "Trials", "Runtime"]
-        fh.write(snl.summary(columns=cols).to_markdown())
-    snl.estimate_accuracy(phase="0th", filename="accuracy_0th.jpg")
-    snl.estimate_accuracy(phase="6th", filename="accuracy_6th.jpg")
+    report.table("summary_accuracy.md", columns=["Start", "End", "RMSLE", "Trials", "Runtime"])
+    report.accuracy("0th", "accuracy_0th.jpg")
+    report.accuracy("6th", "accuracy_6th.jpg")
+    with instrument.stage("render"):
+        report.render()
+    instrument.save()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import os
+from pathlib import Path
+import sys
+import pandas as pd
+import covsirphy as cs
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from toolkit import CachedDataLoader, EstimationCache  # noqa: E402
+
+
+# Scenario shared by the candidates in a worker process, which will be created with _init_worker()
+_worker_dict = {}
+
+
+def _init_worker(jhu_data, population_data, country, province, tau, cache):
+    """
+    Create the scenario of the worker process with S-R trend analysis.
+
+    Args:
+        jhu_data (covsirphy.JHUData): case data
+        population_data (covsirphy.PopulationData): population data
+        country (str): country name
+        province (str or None): province name
+        tau (int): tau value [min]
+        cache (toolkit.EstimationCache or None): cache of the results of parameter estimation
+
+    Notes:
+        With "fork" start method, the data will not be copied until they are changed.
+    """
+    scenario = cs.Scenario(jhu_data, population_data, country=country, province=province, tau=tau)
+    scenario.trend(show_figure=False)
+    _worker_dict["scenario"] = scenario
+    _worker_dict["cache"] = cache
+
+
+def _evaluate(date, phases, model, estimate_kwargs):
+    """
+    Combine the phases, separate them at the date and estimate the parameter values.
+
+    Args:
+        date (str): candidate of the change date, like 01Mar2020
+        phases (list[str]): names of the phases to combine, like ["0th", "1st"]
+        model (covsirphy.ModelBase): ODE model
+        estimate_kwargs (dict(str, object)): keyword arguments of covsirphy.Estimator.run()
+
+    Returns:
+        dict(str, float): phase names (keys) and RMSLE scores (values)
+
+    Notes:
+        PhaseUnit.estimate() will be used instead of Scenario.estimate() to avoid creating a process pool
+        with CPU count processes in each worker process.
+        When the cache was registered, the phases estimated with the previous runs will not be estimated.
+    """
+    scenario = _worker_dict["scenario"]
+    cache = _worker_dict["cache"]
+    # Re-use one phase series to keep memory usage of the worker constant
+    name = "Candidate"
+    scenario.clear(name=name)
+    scenario.combine(phases=phases, name=name)
+    scenario.separate(date=date, name=name)
+    series = scenario[name]
+    score_dict = {}
+    for phase in phases:
+        unit = series.unit(phase)
+        if cache is None:
+            unit.set_ode(model=model, tau=scenario.tau)
+            unit.estimate(record_df=scenario.record_df, **estimate_kwargs)
+        else:
+            cache.estimate_unit(
+                unit, scenario.record_df, model, scenario.tau, scenario.country, province=scenario.province,
+                **estimate_kwargs)
+        score_dict[phase] = unit.to_dict()["RMSLE"]
+    return score_dict
+
+
+def candidate_dates(start_date, end_date, step=1):
+    """
+    Return candidates of change dates.
+
+    Args:
+        start_date (str): the first date, like 01Mar2020
+        end_date (str): the last date, like 12Apr2020
+        step (int): interval [day] of the candidates
+
+    Returns:
+        list[str]: candidate dates, like ["01Mar2020", "02Mar2020"]
+    """
+    if not isinstance(step, int) or step < 1:
+        raise ValueError(f"@step must be a natural number, but {step} was applied.")
+    dates = pd.date_range(
+        pd.to_datetime(start_date, format="%d%b%Y"), pd.to_datetime(end_date, format="%d%b%Y"), freq=f"{step}D")
+    return dates.strftime("%d%b%Y").tolist()
+
+
+class ChangePointSearch(object):
+    """
+    Search for the best change date of two phases, evaluating the candidates with a process pool.
+
+    Args:
+        jhu_data (covsirphy.JHUData): case data
+        population_data (covsirphy.PopulationData): population data
+        country (str): country name
+        province (str or None): province name
+        phases (list[str]): names of the two phases to combine and separate, like ["0th", "1st"]
+        model (covsirphy.ModelBase): ODE model
+        tau (int): tau value [min], which must be fixed to compare the candidates
+        max_workers (int or None): the number of worker processes, or None (CPU count)
+        cache (toolkit.EstimationCache or None): cache of the results of parameter estimation, or None (not used)
+
+    Notes:
+        Each worker process creates a scenario with S-R trend analysis only once,
+        and the records will be shared with the candidates evaluated in the worker.
+    """
+
+    def __init__(self, jhu_data, population_data, country, province=None, phases=None,
+                 model=cs.SIRF, tau=720, max_workers=None, cache=None):
+        self.jhu_data = jhu_data
+        self.population_data = population_data
+        self.country = country
+        self.province = province
+        self.phases = phases or ["0th", "1st"]
+        if len(self.phases) != 2:
+            raise ValueError(f"@phases must have two phase names, but {phases} was applied.")
+        self.model = model
+        if tau is None:
+            raise ValueError("@tau must be fixed to compare the candidates, but None was applied.")
+        self.tau = tau
+        self.max_workers = max_workers or os.cpu_count()
+        self.cache = cache
+        # {date: {phase: RMSLE}}
+        self.opt_dict = {}
+
+    def run(self, candidates, threshold=None, **kwargs):
+        """
+        Evaluate the candidates of the change date.
+
+        Args:
+            candidates (list[str]): candidates of the change date, like ["01Mar2020", "12Apr2020"]
+            threshold (float or None): the candidates will not be evaluated any more when the maximum RMSLE score
+                of the phases is under this value, or None (evaluate all candidates)
+            kwargs: keyword arguments of covsirphy.Estimator.run(), like timeout
+
+        Returns:
+            pandas.DataFrame: RMSLE scores of the evaluated candidates
+                Index:
+                    candidate dates (str)
+                Columns:
+                    RMSLE scores of the phases (float)
+
+        Notes:
+            With @threshold, candidates which have not been started will be cancelled
+            and the order of evaluation follows the order of @candidates.
+            When @candidates is empty, the scores evaluated in advance will be returned without worker processes.
+        """
+        if not candidates:
+            return self.result()
+        estimate_kwargs = {"stdout": False}
+        estimate_kwargs.update(kwargs)
+        initargs = (self.jhu_data, self.population_data, self.country, self.province, self.tau, self.cache)
+        with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(candidates)), initializer=_init_worker,
+                initargs=initargs) as executor:
+            future_dict = {
+                executor.submit(_evaluate, date, self.phases, self.model, estimate_kwargs): date
+                for date in candidates}
+            pending = set(future_dict)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.cancelled():
+                        continue
+                    score_dict = future.result()
+                    self.opt_dict[future_dict[future]] = score_dict
+                    if threshold is not None and max(score_dict.values()) < threshold:
+                        for remaining in pending:
+                            remaining.cancel()
+        return self.result()
+
+    def result(self):
+        """
+        Return the RMSLE scores of the evaluated candidates.
+
+        Returns:
+            pandas.DataFrame: RMSLE scores of the candidates, sorted by candidate dates
+                Index:
+                    candidate dates (str)
+                Columns:
+                    RMSLE scores of the phases (float)
+        """
+        df = pd.DataFrame.from_dict(self.opt_dict, orient="index", columns=self.phases)
+        if df.empty:
+            return df
+        return df.loc[sorted(df.index, key=lambda date: pd.to_datetime(date, format="%d%b%Y"))]
+
+    def best(self):
+        """
+        Return the candidate with the lowest maximum RMSLE score of the phases.
+
+        Raises:
+            ValueError: no candidates were evaluated
+
+        Returns:
+            str: candidate date, like 12Apr2020
+        """
+        df = self.result()
+        if df.empty:
+            raise ValueError("ChangePointSearch.run() must be done in advance.")
+        return df.max(axis=1).idxmin()
+
+    def save(self, filename="opt.md"):
+        """
+        Save the RMSLE scores of the evaluated candidates as a markdown table.
+
+        Args:
+            filename (str): filename to save
+        """
+        with open(filename, "w") as fh:
+            fh.write(self.result().to_markdown())
+
+
+def main():
+    print(cs.__version__)
+    # Data loading
+    data_loader = CachedDataLoader("input")
+    jhu_data = data_loader.jhu(verbose=True)
+    population_data = data_loader.population(verbose=True)
+    # For Japan
+    japan_data = data_loader.japan()
+    jhu_data.replace(japan_data)
+    # Optimize change point
+    search = ChangePointSearch(
+        jhu_data, population_data, country="Japan", phases=["0th", "1st"], tau=720,
+        cache=EstimationCache("input/cache/estimation"))
+    search.run(candidate_dates("01Mar2020", "12Apr2020", step=7), threshold=0.3)
+    search.save("opt_search.md")
+    print(search.best())
+
+
+if __name__ == "__main__":
+    main()
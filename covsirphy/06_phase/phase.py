@@ -1,8 +1,12 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import pandas as pd
+from pathlib import Path
+import sys
 import covsirphy as cs
+from change_point import ChangePointSearch
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from toolkit import CachedDataLoader, EstimationCache  # noqa: E402
 
 
 def md(scenario, filename, name=None):
@@ -13,7 +17,7 @@ def md(scenario, filename, name=None):
 def main():
     print(cs.__version__)
     # Data loading
-    data_loader = cs.DataLoader("input")
+    data_loader = CachedDataLoader("input")
     jhu_data = data_loader.jhu(verbose=True)
     population_data = data_loader.population(verbose=True)
     # For Japan
@@ -70,19 +74,11 @@ def main():
     md(snl, "G.md", "G")
     # Optimize change point
     candidates = ["01Mar2020", "12Apr2020"]
-    opt_dict = {date: {} for date in candidates}
-    snl_opt = cs.Scenario(jhu_data, population_data, country="Japan", tau=720)
-    snl_opt.trend(show_figure=False)
-    for date in candidates:
-        snl_opt.clear(name=date)
-        snl_opt.combine(phases=["0th", "1st"], name=date)
-        snl_opt.separate(date=date, name=date)
-        snl_opt.estimate(cs.SIRF, phases=["0th", "1st"], name=date)
-        opt_dict[date]["0th"] = snl_opt.get("RMSLE", phase="0th", name=date)
-        opt_dict[date]["1st"] = snl_opt.get("RMSLE", phase="1st", name=date)
-    with open("opt.md", "w") as fh:
-        df = pd.DataFrame.from_dict(opt_dict, orient="index")
-        fh.write(df.to_markdown())
+    search = ChangePointSearch(
+        jhu_data, population_data, country="Japan", phases=["0th", "1st"], tau=720,
+        cache=EstimationCache("input/cache/estimation"))
+    search.run(candidates)
+    search.save("opt.md")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+from pathlib import Path
+import sys
+import time
+import traceback
+import pandas as pd
+import covsirphy as cs
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from toolkit import CachedDataLoader, EstimationCache  # noqa: E402
+
+
+# Datasets shared by the countries in a worker process, which will be registered with _init_worker()
+_worker_dict = {}
+
+
+def _init_worker(jhu_data, population_data, cache):
+    """
+    Register the datasets to the worker process.
+
+    Args:
+        jhu_data (covsirphy.JHUData): case data
+        population_data (covsirphy.PopulationData): population data
+        cache (toolkit.EstimationCache or None): cache of the results of parameter estimation
+
+    Notes:
+        With "fork" start method, the datasets will not be copied until they are changed.
+    """
+    _worker_dict["jhu_data"] = jhu_data
+    _worker_dict["population_data"] = population_data
+    _worker_dict["cache"] = cache
+
+
+def _run_country(country, model, end_date, days, n_jobs):
+    """
+    Run the scenario pipeline (records, S-R trend analysis, parameter estimation and prediction) for a country.
+
+    Args:
+        country (str): country name
+        model (covsirphy.ModelBase): ODE model
+        end_date (str or None): end date of the first future phase, or None (not added)
+        days (int or None): the number of days of the second future phase, or None (not added)
+        n_jobs (int): the number of processes of parameter estimation for each country
+
+    Returns:
+        dict(str, object):
+            - summary (pandas.DataFrame or None): Scenario.summary(name="Main")
+            - describe (pandas.DataFrame or None): Scenario.describe()
+            - track (pandas.DataFrame or None): Scenario.track()
+            - timing (dict(str, float)): stages (keys) and elapsed time [sec] (values)
+            - error (str or None): traceback when the pipeline failed
+    """
+    timing = {}
+    result_dict = {"summary": None, "describe": None, "track": None, "timing": timing, "error": None}
+    start = time.perf_counter()
+    stage = "scenario"
+    try:
+        snl = cs.Scenario(_worker_dict["jhu_data"], _worker_dict["population_data"], country=country)
+        timing[stage] = time.perf_counter() - start
+        # S-R trend analysis
+        stage, start = "trend", time.perf_counter()
+        snl.trend(show_figure=False)
+        timing[stage] = time.perf_counter() - start
+        # Parameter estimation
+        stage, start = "estimate", time.perf_counter()
+        cache = _worker_dict["cache"]
+        if cache is None:
+            snl.estimate(model, n_jobs=n_jobs, stdout=False)
+        else:
+            cache.estimate(snl, model, n_jobs=n_jobs, stdout=False)
+        timing[stage] = time.perf_counter() - start
+        # Future phases
+        stage, start = "add", time.perf_counter()
+        if end_date is not None:
+            snl.add(end_date=end_date, name="Main")
+        if days is not None:
+            snl.add(days=days, name="Main")
+        timing[stage] = time.perf_counter() - start
+        # Outputs
+        stage, start = "history", time.perf_counter()
+        result_dict["summary"] = snl.summary(name="Main")
+        result_dict["describe"] = snl.describe()
+        result_dict["track"] = snl.track()
+        timing[stage] = time.perf_counter() - start
+    except Exception:
+        timing[stage] = time.perf_counter() - start
+        result_dict["error"] = traceback.format_exc()
+    return result_dict
+
+
+class ScenarioBatch(object):
+    """
+    Run the scenario pipeline for many countries with a process pool.
+
+    Args:
+        jhu_data (covsirphy.JHUData): case data
+        population_data (covsirphy.PopulationData): population data
+        countries (list[str]): country names
+        model (covsirphy.ModelBase): ODE model
+        max_workers (int or None): the number of worker processes, or None (CPU count)
+        n_jobs (int): the number of processes of parameter estimation for each country
+        cache (toolkit.EstimationCache or None): cache of the results of parameter estimation, or None (not used)
+
+    Notes:
+        The datasets will be loaded only once and registered to the worker processes when they start.
+        Failure of a country does not stop the pipeline of the other countries.
+    """
+
+    def __init__(self, jhu_data, population_data, countries, model=cs.SIRF, max_workers=None, n_jobs=1, cache=None):
+        if not isinstance(countries, (list, tuple)):
+            raise TypeError(f"@countries must be a list of country names, but {countries} was applied.")
+        self.jhu_data = jhu_data
+        self.population_data = population_data
+        self.countries = list(dict.fromkeys(countries))
+        self.model = model
+        self.max_workers = max_workers or os.cpu_count()
+        self.n_jobs = n_jobs
+        self.cache = cache
+        # {country: result dictionary}
+        self._result_dict = {}
+
+    def run(self, end_date="31Dec2020", days=100, verbose=True):
+        """
+        Run the pipeline for the countries.
+
+        Args:
+            end_date (str or None): end date of the first future phase, or None (not added)
+            days (int or None): the number of days of the second future phase, or None (not added)
+            verbose (bool): whether show the progress or not
+
+        Returns:
+            ScenarioBatch: self
+
+        Notes:
+            When no countries were registered, worker processes will not be created and the outputs will be empty.
+        """
+        if not self.countries:
+            return self
+        initargs = (self.jhu_data, self.population_data, self.cache)
+        with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(self.countries)), initializer=_init_worker,
+                initargs=initargs) as executor:
+            future_dict = {
+                executor.submit(_run_country, country, self.model, end_date, days, self.n_jobs): country
+                for country in self.countries}
+            for (i, future) in enumerate(as_completed(future_dict), start=1):
+                country = future_dict[future]
+                self._result_dict[country] = future.result()
+                if verbose:
+                    status = "failed" if self._result_dict[country]["error"] else "finished"
+                    total = sum(self._result_dict[country]["timing"].values())
+                    print(f"[{i:>3}/{len(self.countries)}] {country}: {status} in {total:.1f} sec")
+        return self
+
+    def _concat(self, key, names):
+        """
+        Concatenate the outputs of the countries.
+
+        Args:
+            key (str): summary, describe or track
+            names (list[str]): names of the index levels
+
+        Returns:
+            pandas.DataFrame: the outputs with country names as the first level of the index
+        """
+        dataframes = {
+            country: self._result_dict[country][key] for country in self.countries
+            if country in self._result_dict and self._result_dict[country][key] is not None}
+        if not dataframes:
+            return pd.DataFrame()
+        return pd.concat(dataframes, axis=0, sort=False, names=names)
+
+    def summary(self):
+        """
+        Return the summary of phases in the main scenario.
+
+        Returns:
+            pandas.DataFrame: Scenario.summary(name="Main") of the countries
+                Index:
+                    - Country (str): country names
+                    - Phase (str): phase name
+                Columns:
+                    the same as Scenario.summary()
+        """
+        return self._concat("summary", names=["Country", "Phase"])
+
+    def describe(self):
+        """
+        Return the representative values.
+
+        Returns:
+            pandas.DataFrame: Scenario.describe() of the countries
+                Index:
+                    - Country (str): country names
+                    - Scenario (str): phase series name
+                Columns:
+                    the same as Scenario.describe()
+        """
+        return self._concat("describe", names=["Country", "Scenario"])
+
+    def track(self):
+        """
+        Return values of parameters and variables.
+
+        Returns:
+            pandas.DataFrame: Scenario.track() of the countries
+                Index:
+                    reset index
+                Columns:
+                    - Country (str): country names
+                    - the same as Scenario.track()
+        """
+        df = self._concat("track", names=["Country", None])
+        if df.empty:
+            return df
+        return df.reset_index(level=0).reset_index(drop=True)
+
+    def timing(self):
+        """
+        Return elapsed time of the stages.
+
+        Returns:
+            pandas.DataFrame:
+                Index:
+                    Country (str): country names
+                Columns:
+                    - scenario, trend, estimate, add, history (float): elapsed time [sec] of the stages
+                    - total (float): total elapsed time [sec]
+                    - error (bool): whether the pipeline failed or not
+        """
+        df = pd.DataFrame.from_dict(
+            {country: result_dict["timing"] for (country, result_dict) in self._result_dict.items()},
+            orient="index", columns=["scenario", "trend", "estimate", "add", "history"])
+        df.index.name = "Country"
+        df["total"] = df.sum(axis=1)
+        df["error"] = [self._result_dict[country]["error"] is not None for country in df.index]
+        return df
+
+    def errors(self):
+        """
+        Return the errors of the countries.
+
+        Returns:
+            dict(str, str): country names (keys) and tracebacks (values)
+        """
+        return {
+            country: result_dict["error"] for (country, result_dict) in self._result_dict.items()
+            if result_dict["error"] is not None}
+
+    def save(self, directory="batch"):
+        """
+        Save the consolidated tables as CSV files in the directory.
+
+        Args:
+            directory (str): directory to save summary.csv, describe.csv, track.csv and timing.csv
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.summary().to_csv(os.path.join(directory, "summary.csv"))
+        self.describe().to_csv(os.path.join(directory, "describe.csv"))
+        self.track().to_csv(os.path.join(directory, "track.csv"), index=False)
+        self.timing().to_csv(os.path.join(directory, "timing.csv"))
+
+
+def main():
+    print(cs.__version__)
+    # Data loading
+    data_loader = CachedDataLoader("input")
+    jhu_data = data_loader.jhu(verbose=True)
+    population_data = data_loader.population(verbose=True)
+    # For Japan
+    japan_data = data_loader.japan()
+    jhu_data.replace(japan_data)
+    # Countries
+    countries = sorted(set(jhu_data.countries()) & set(population_data.countries()))
+    batch = ScenarioBatch(
+        jhu_data, population_data, countries, model=cs.SIRF, cache=EstimationCache("input/cache/estimation"))
+    batch.run(end_date="31Dec2020", days=100)
+    batch.save("batch")
+    with open("batch_timing.md", "w") as fh:
+        fh.write(batch.timing().describe().to_markdown())
+    for (country, error) in batch.errors().items():
+        print(f"{country}:\n{error}")
+
+
+if __name__ == "__main__":
+    main()
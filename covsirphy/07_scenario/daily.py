@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+from pathlib import Path
+import sys
+import covsirphy as cs
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from toolkit import CachedDataLoader, IncrementalScenario, Instrument  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Update the scenario of Japan with the records of today.")
+    parser.add_argument("--full", action="store_true", help="detect the phases again with S-R trend analysis")
+    parser.add_argument("--output", default="daily", help="directory to save summary.csv and track.csv")
+    args = parser.parse_args()
+    print(cs.__version__)
+    # Stages will be recorded when COVSIRPHY_METRICS_DIR is set
+    instrument = Instrument.from_env("daily", labels={"country": "Japan"})
+    # Data loading
+    data_loader = instrument.wrap(CachedDataLoader("input"), ["jhu", "population", "japan"])
+    jhu_data = data_loader.jhu(verbose=True)
+    population_data = data_loader.population(verbose=True)
+    # For Japan
+    japan_data = data_loader.japan()
+    jhu_data.replace(japan_data)
+    # Only the phases whose records were changed will be estimated again
+    incremental = IncrementalScenario(population_data, country="Japan", model=cs.SIRF)
+    status_dict = instrument.call("update", incremental.update, jhu_data, full=args.full)
+    for (phase, status) in status_dict.items():
+        print(f"{phase}: {status}")
+    with instrument.stage("save"):
+        incremental.save(args.output)
+    instrument.save()
+
+
+if __name__ == "__main__":
+    main()
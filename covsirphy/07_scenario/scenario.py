@@ -1,8 +1,12 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+from pathlib import Path
+import sys
 import pandas as pd
 import covsirphy as cs
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from toolkit import CachedDataLoader, EstimationCache, Instrument, Report  # noqa: E402
 
 
 def md(scenario, filename, columns=None, name=None):
@@ -12,8 +16,10 @@ def md(scenario, filename, columns=None, name=None):
 
 def main():
     print(cs.__version__)
+    # Stages will be recorded when COVSIRPHY_METRICS_DIR is set
+    instrument = Instrument.from_env("scenario", labels={"country": "Japan"})
     # Data loading
-    data_loader = cs.DataLoader("input")
+    data_loader = instrument.wrap(CachedDataLoader("input"), ["jhu", "population", "japan"])
     jhu_data = data_loader.jhu(verbose=True)
     population_data = data_loader.population(verbose=True)
     # For Japan
@@ -21,15 +27,17 @@ def main():
     jhu_data.replace(japan_data)
     print(japan_data.citation)
     # Records
-    snl = cs.Scenario(jhu_data, population_data, country="Japan")
+    snl = instrument.call("scenario", cs.Scenario, jhu_data, population_data, country="Japan")
+    instrument.wrap(snl, ["records", "trend", "estimate", "history", "track"])
     snl.records(filename="records.jpg")
     # S-R trend analysis
     snl.trend(filename="trend.jpg")
     # Separate 0th phase
     snl.separate("01Apr2020")
     md(snl, "trend.md", name="Main")
-    # Parameter estimation
-    snl.estimate(cs.SIRF)
+    # Parameter estimation (the phases estimated with the previous runs will be restored)
+    cache = EstimationCache("input/cache/estimation")
+    instrument.call("estimate", cache.estimate, snl, cs.SIRF)
     est_cols = ["Start", "End", "Rt", *cs.SIRF.PARAMETERS, "RMSLE"]
     md(snl, "estimate.md", columns=est_cols, name="Main")
     # New
@@ -55,13 +63,15 @@ def main():
     snl.delete(phases=["last"], name="Medicine")
     md(snl, "med2.md", columns=cols, name="Medicine")
     # History
-    snl.history("sigma", filename="sigma.jpg")
-    snl.history("Rt", filename="rt.jpg")
-    snl.history("Infected", filename="infected.jpg")
-    with open("describe.md", "w") as fh:
-        fh.write(snl.describe().to_markdown())
-    with open("simulate.md", "w") as fh:
-        fh.write(snl.track().tail().to_markdown())
+    report = Report(snl)
+    report.history("sigma", "sigma.jpg")
+    report.history("Rt", "rt.jpg")
+    report.history("Infected", "infected.jpg")
+    report.markdown(snl.describe(), "describe.md")
+    report.markdown(report.track().tail(), "simulate.md")
+    with instrument.stage("render"):
+        report.render()
+    instrument.save()
 
 
 if __name__ == "__main__":
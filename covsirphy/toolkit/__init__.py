@@ -0,0 +1,14 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from toolkit.data_cache import CachedDataLoader, compact_frame, expand_frame, file_digest
+from toolkit.estimate_cache import EstimationCache
+from toolkit.incremental import IncrementalScenario
+from toolkit.instrument import Instrument
+from toolkit.report import Report
+from toolkit.simulate import simulate_batch
+
+__all__ = [
+    "CachedDataLoader", "compact_frame", "expand_frame", "file_digest", "EstimationCache",
+    "IncrementalScenario", "Instrument", "Report", "simulate_batch",
+]
@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import time
+import pandas as pd
+import covsirphy as cs
+
+
+def file_digest(filename, chunksize=1024 ** 2):
+    """
+    Return SHA-1 digest of the file contents.
+
+    Args:
+        filename (str or pathlib.Path): filename
+        chunksize (int): the number of bytes to read at once
+
+    Returns:
+        str: hexadecimal digest
+    """
+    sha1 = hashlib.sha1()
+    with open(filename, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunksize), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def compact_frame(df, categories=("ISO3", "Country", "Province")):
+    """
+    Convert the columns of a dataframe to memory-efficient data types.
+
+    Args:
+        df (pandas.DataFrame): dataframe
+        categories (tuple(str)): columns to convert to categorical columns
+
+    Returns:
+        pandas.DataFrame: converted dataframe, integer columns will be downcast to the smallest types
+    """
+    df = df.copy()
+    for col in df.columns:
+        if col in categories:
+            df[col] = df[col].astype("category")
+        elif pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+    return df
+
+
+def expand_frame(df, categories=True):
+    """
+    Restore the data types of a dataframe converted with compact_frame().
+
+    Args:
+        df (pandas.DataFrame): dataframe
+        categories (bool): whether convert categorical columns to object columns or not
+
+    Returns:
+        pandas.DataFrame: categorical columns as object columns (if @categories is True)
+            and integer columns as 64-bit integers
+
+    Notes:
+        The columns of @df will be replaced without copying the dataframe.
+    """
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            if categories:
+                df[col] = df[col].astype(object)
+        elif pd.api.types.is_integer_dtype(df[col]):
+            df[col] = df[col].astype("int64")
+    return df
+
+
+class CachedDataLoader(cs.DataLoader):
+    """
+    DataLoader which caches the cleaned datasets, invalidated when the source CSV files were changed.
+
+    Args:
+        directory (str or pathlib.Path): directory to save the downloaded files and the cache
+        update_interval (int): update interval [hour] of the downloaded files and the cache
+        compact (bool): whether JHU dataset keeps ISO3/Country/Province columns as categorical columns or not
+
+    Raises:
+        FileNotFoundError: covsirphy.DataLoader did not save the source file as expected
+
+    Notes:
+        The cache is saved in "{directory}/cache" as "jhu.parquet", "population.csv" and "oxcgrt.csv"
+        with "{name}.json" (metadata). The cache will be used when it was created within @update_interval hours
+        and SHA-1 digest of the source file has not been changed. Otherwise, the dataset will be created
+        with covsirphy.DataLoader (which checks the remote server) and the cache will be updated.
+        The datasets will be restored with the public constructors of covsirphy, JHUData.from_dataframe()
+        and PopulationData/OxCGRTData with the cleaned data as their source files.
+        Raw data of the datasets loaded from the cache are empty (JHU) or the cleaned data (the others).
+        Integer columns are kept as int64 even with @compact because covsirphy aggregates the records
+        (e.g. grouped by Province) and the values of large areas may overflow downcast integers.
+        japan() is the same as covsirphy.DataLoader.japan() because the source file is small.
+    """
+    CACHE_VERSION = 2
+    # The same as the default basename of COVID-19 Data Hub dataset with covsirphy.DataLoader
+    DH_BASENAME = "covid19dh.csv"
+
+    def __init__(self, directory="input", update_interval=12, compact=True):
+        super().__init__(directory=directory, update_interval=update_interval)
+        self.cache_dir = self.dir_path / "cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.compact = compact
+
+    def _source(self, basename):
+        """
+        Return the absolute path of the source file in the directory.
+
+        Args:
+            basename (str or None): basename of the file, or None (CachedDataLoader.DH_BASENAME)
+
+        Returns:
+            str: absolute path of the file
+        """
+        return str((self.dir_path / (basename or self.DH_BASENAME)).resolve())
+
+    def _metadata(self, source):
+        """
+        Return the metadata of the source file.
+
+        Args:
+            source (str): filename of the source CSV file
+
+        Returns:
+            dict(str, object): version of the cache/covsirphy, created time, source filename, size, modified time
+                and digest
+        """
+        stat = os.stat(source)
+        return {
+            "version": self.CACHE_VERSION,
+            "covsirphy": cs.__version__,
+            "created": time.time(),
+            "source": str(source),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "digest": file_digest(source),
+        }
+
+    def _is_valid(self, filename, source):
+        """
+        Return whether the cache of the dataset is valid or not.
+
+        Args:
+            filename (str): filename of the cache in the cache directory, like jhu.parquet
+            source (str): filename of the source CSV file
+
+        Returns:
+            bool: whether the cache is valid or not
+
+        Notes:
+            The digest of the source will be calculated only when the size or modified time was changed.
+        """
+        json_path = self.cache_dir / f"{Path(filename).stem}.json"
+        if not json_path.exists() or not (self.cache_dir / filename).exists() or not os.path.exists(source):
+            return False
+        with json_path.open("r") as fh:
+            cached_dict = json.load(fh)
+        if cached_dict.get("version") != self.CACHE_VERSION or cached_dict.get("covsirphy") != cs.__version__:
+            return False
+        if time.time() - cached_dict["created"] >= self.update_interval * 3600:
+            return False
+        stat = os.stat(source)
+        if (cached_dict["size"], cached_dict["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+            return True
+        if cached_dict["digest"] != file_digest(source):
+            return False
+        # The file was touched, but the contents were not changed
+        cached_dict.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        with json_path.open("w") as fh:
+            json.dump(cached_dict, fh, indent=4)
+        return True
+
+    def _write(self, filename, source, df):
+        """
+        Save the cleaned data as the cache of the dataset.
+
+        Args:
+            filename (str): filename of the cache in the cache directory, Parquet (converted with compact_frame())
+                or CSV file
+            source (str): filename of the source CSV file
+            df (pandas.DataFrame): the cleaned data
+        """
+        path = self.cache_dir / filename
+        if path.suffix == ".parquet":
+            compact_frame(df).to_parquet(f"{path}.tmp", index=False)
+        else:
+            df.to_csv(f"{path}.tmp", index=False)
+        os.replace(f"{path}.tmp", path)
+        with (self.cache_dir / f"{path.stem}.json").open("w") as fh:
+            json.dump(self._metadata(source), fh, indent=4)
+
+    def _cached(self, filename, source, create, restore, citation):
+        """
+        Return the dataset, using the cache if available.
+
+        Args:
+            filename (str): filename of the cache in the cache directory
+            source (str): filename of the source CSV file
+            create (function): function to create the dataset with covsirphy.DataLoader
+            restore (function): function to create the dataset with the path of the cache
+            citation (str): citation of the dataset
+
+        Returns:
+            covsirphy.CleaningBase: the dataset
+        """
+        if not self._is_valid(filename, source):
+            data_instance = create()
+            self._write(filename, source, data_instance.cleaned())
+            if not self.compact:
+                return data_instance
+        data_instance = restore(self.cache_dir / filename)
+        data_instance.citation = citation
+        return data_instance
+
+    def jhu(self, basename=None, local_file=None, verbose=True):
+        """
+        Load JHU dataset (the number of cases), using the cache if available.
+
+        Args:
+            basename (str or None): basename of the file to save the data
+            local_file (str or None): if not None, load the data from this file without the cache
+            verbose (bool): if True, detailed citation list will be shown when downloading
+
+        Returns:
+            covsirphy.JHUData: JHU dataset
+        """
+        if local_file is not None:
+            return super().jhu(basename=basename, local_file=local_file, verbose=verbose)
+        return self._cached(
+            "jhu.parquet", self._source(basename),
+            lambda: super(CachedDataLoader, self).jhu(basename=basename, verbose=verbose),
+            lambda path: cs.JHUData.from_dataframe(expand_frame(pd.read_parquet(path), categories=not self.compact)),
+            self.jhu_citation)
+
+    def population(self, basename=None, local_file=None, verbose=True):
+        """
+        Load Population dataset, using the cache if available.
+
+        Args:
+            basename (str or None): basename of the file to save the data
+            local_file (str or None): if not None, load the data from this file without the cache
+            verbose (bool): if True, detailed citation list will be shown when downloading
+
+        Returns:
+            covsirphy.PopulationData: Population dataset
+        """
+        if local_file is not None:
+            return super().population(basename=basename, local_file=local_file, verbose=verbose)
+        return self._cached(
+            "population.csv", self._source(basename),
+            lambda: super(CachedDataLoader, self).population(basename=basename, verbose=verbose),
+            lambda path: cs.PopulationData(filename=str(path)),
+            self.population_citation)
+
+    def oxcgrt(self, basename=None, local_file=None, verbose=True):
+        """
+        Load OxCGRT dataset, using the cache if available.
+
+        Args:
+            basename (str or None): basename of the file to save the data
+            local_file (str or None): if not None, load the data from this file without the cache
+            verbose (bool): if True, detailed citation list will be shown when downloading
+
+        Returns:
+            covsirphy.OxCGRTData: OxCGRT dataset
+        """
+        if local_file is not None:
+            return super().oxcgrt(basename=basename, local_file=local_file, verbose=verbose)
+        return self._cached(
+            "oxcgrt.csv", self._source(basename),
+            lambda: super(CachedDataLoader, self).oxcgrt(basename=basename, verbose=verbose),
+            lambda path: cs.OxCGRTData(filename=str(path)),
+            self.oxcgrt_citation)
+
+    def clear_cache(self):
+        """
+        Remove the cached datasets.
+        """
+        for path in Path(self.cache_dir).glob("*"):
+            if path.suffix in (".parquet", ".csv", ".json"):
+                path.unlink()
@@ -0,0 +1,388 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import datetime
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+import warnings
+from optuna.distributions import UniformDistribution
+from optuna.exceptions import ExperimentalWarning
+from optuna.trial import create_trial
+import pandas as pd
+import covsirphy as cs
+
+# Version of covsirphy (pinned in Pipfile.lock) with which the private APIs used in this module and
+# toolkit.incremental were confirmed: Estimator._init_study(), PhaseUnit._estimator, PhaseUnit.est_dict
+# and PhaseUnit._read_estimator(). Confirm them again when covsirphy is updated.
+COVSIRPHY_VERSION = "2.8.3"
+
+
+def phase_records(record_df, start_date, end_date):
+    """
+    Return the records of a phase.
+
+    Args:
+        record_df (pandas.DataFrame): records with Date, Confirmed, Infected, Fatal and Recovered columns
+        start_date (str): start date of the phase, like 22Jan2020
+        end_date (str): end date of the phase, like 22Jan2020
+
+    Returns:
+        pandas.DataFrame: the records from the start date to the end date
+    """
+    series = record_df[cs.Term.DATE]
+    start = pd.to_datetime(start_date, format=cs.Term.DATE_FORMAT)
+    end = pd.to_datetime(end_date, format=cs.Term.DATE_FORMAT)
+    return record_df.loc[(series >= start) & (series <= end), :]
+
+
+def records_digest(record_df, start_date, end_date):
+    """
+    Return SHA-1 digest of the records of a phase.
+
+    Args:
+        record_df (pandas.DataFrame): records with Date, Confirmed, Infected, Fatal and Recovered columns
+        start_date (str): start date of the phase, like 22Jan2020
+        end_date (str): end date of the phase, like 22Jan2020
+
+    Returns:
+        str: hexadecimal digest
+
+    Notes:
+        Only the records in the phase will be used, and the records of the other phases can be changed
+        without changing the digest.
+    """
+    df = phase_records(record_df, start_date, end_date).loc[:, [cs.Term.DATE, *cs.Term.VALUE_COLUMNS]]
+    hashed = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.sha1(hashed.tobytes()).hexdigest()
+
+
+def run_settings(**kwargs):
+    """
+    Return the settings of optimization which will be applied with covsirphy.Estimator.run().
+
+    Args:
+        kwargs: keyword arguments of covsirphy.Estimator.run(), the other arguments will be ignored
+
+    Returns:
+        dict(str, object): the arguments of Estimator.run() (e.g. timeout, seed) and the values,
+            including the default values of the arguments which were not specified
+    """
+    parameters = inspect.signature(cs.Estimator.run).parameters
+    return {
+        name: kwargs.get(name, parameter.default) for (name, parameter) in parameters.items()
+        if parameter.default is not inspect.Parameter.empty}
+
+
+def restore_estimator(model, record_df, population, tau, param_dict, score):
+    """
+    Create an estimator whose best parameter values are the specified values, without optimization.
+
+    Args:
+        model (covsirphy.ModelBase): ODE model
+        record_df (pandas.DataFrame): records of the phase
+        population (int): total population
+        tau (int): tau value [min]
+        param_dict (dict(str, float)): parameter values of the model
+        score (float): value of the trial, like RMSLE
+
+    Returns:
+        covsirphy.Estimator: estimator with only one trial, which can be used for Estimator.accuracy()
+
+    Notes:
+        The trial will be registered without evaluating the objective function (simulation).
+    """
+    estimator = cs.Estimator(record_df, model, population, tau=tau)
+    estimator._init_study(seed=0)
+    trial = create_trial(
+        params=param_dict, distributions={k: UniformDistribution(v, v) for (k, v) in param_dict.items()},
+        value=score)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=ExperimentalWarning)
+        estimator.study.add_trial(trial)
+    estimator.total_trials = len(estimator.study.trials)
+    return estimator
+
+
+class EstimationCache(object):
+    """
+    Persistent cache of the results of parameter estimation, saved as JSON files in a directory.
+
+    Args:
+        directory (str or pathlib.Path): directory to save the results
+
+    Notes:
+        A result is identified with the records of the phase (SHA-1 digest), country, province,
+        start/end dates and population of the phase, model name, tau value (or None, estimated),
+        fixed parameter values, the settings of Estimator.run() (e.g. timeout) and the version of covsirphy.
+        Parameter values, tau value, RMSLE, the number of trials and runtime of the estimation will be saved.
+        Estimators of the phases restored from the cache have only one trial with the saved parameter values,
+        and they can be used to show the accuracy of estimation, but not to show the history of the trials.
+        Private APIs of covsirphy are used to restore the results, refer to COVSIRPHY_VERSION.
+    """
+    CACHE_VERSION = 2
+
+    def __init__(self, directory="input/cache/estimation"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, record_df, unit, model, tau, country, province=None, namespace=None, **kwargs):
+        """
+        Return the key of the result of parameter estimation.
+
+        Args:
+            record_df (pandas.DataFrame): records with Date, Confirmed, Infected, Fatal and Recovered columns
+            unit (covsirphy.PhaseUnit): the phase
+            model (covsirphy.ModelBase): ODE model
+            tau (int or None): tau value [min], or None (tau value will be estimated)
+            country (str): country name
+            province (str or None): province name
+            namespace (str or None): name to separate the results estimated in the other ways (e.g. warm start),
+                or None (covsirphy.Estimator)
+            kwargs: fixed parameter values of the model and keyword arguments of covsirphy.Estimator.run(),
+                the other arguments will be ignored
+
+        Returns:
+            tuple(str, dict(str, object)): the key (hexadecimal digest) and the values to create it
+        """
+        key_dict = {
+            "version": self.CACHE_VERSION,
+            "covsirphy": cs.__version__,
+            "records": records_digest(record_df, unit.start_date, unit.end_date),
+            "country": country,
+            "province": province or cs.Term.UNKNOWN,
+            "start_date": unit.start_date,
+            "end_date": unit.end_date,
+            "population": int(unit.population),
+            "model": model.NAME,
+            "tau": tau,
+            "params": {k: float(v) for (k, v) in sorted(kwargs.items()) if k in model.PARAMETERS},
+            "run": run_settings(**kwargs),
+        }
+        if namespace is not None:
+            key_dict["namespace"] = namespace
+        key = hashlib.sha1(json.dumps(key_dict, sort_keys=True).encode("utf-8")).hexdigest()
+        return (key, key_dict)
+
+    def __contains__(self, key):
+        """
+        Return whether the result is cached or not, without counting hits and misses.
+
+        Args:
+            key (str): the key
+
+        Returns:
+            bool: whether the result is cached or not
+        """
+        return (self.directory / f"{key}.json").exists()
+
+    def get(self, key):
+        """
+        Return the cached result.
+
+        Args:
+            key (str): the key
+
+        Returns:
+            dict(str, object) or None: the result saved with put() or None (not cached)
+        """
+        path = self.directory / f"{key}.json"
+        if not path.exists():
+            self.misses += 1
+            return None
+        with path.open("r") as fh:
+            entry = json.load(fh)
+        self.hits += 1
+        return entry
+
+    def put(self, key, key_dict, unit, model):
+        """
+        Save the result of parameter estimation of a phase.
+
+        Args:
+            key (str): the key
+            key_dict (dict(str, object)): the values to create the key
+            unit (covsirphy.PhaseUnit): the phase which finished parameter estimation
+            model (covsirphy.ModelBase): ODE model
+
+        Returns:
+            dict(str, object): the saved result
+        """
+        unit_dict = unit.to_dict()
+        entry = {
+            "key": key_dict,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "params": {param: float(unit_dict[param]) for param in model.PARAMETERS},
+            "tau": int(unit_dict[cs.Term.TAU]),
+            "RMSLE": float(unit_dict[cs.Term.RMSLE]),
+            "Trials": int(unit_dict[cs.Term.TRIALS]),
+            "Runtime": unit_dict[cs.Term.RUNTIME],
+        }
+        path = self.directory / f"{key}.json"
+        # Worker processes may save the same result at the same time
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(entry, fh, indent=4)
+        os.replace(tmp_path, path)
+        return entry
+
+    @staticmethod
+    def restore(unit, entry, record_df, model):
+        """
+        Register the cached result to the phase.
+
+        Args:
+            unit (covsirphy.PhaseUnit): the phase
+            entry (dict(str, object)): the result saved with put()
+            record_df (pandas.DataFrame): records with Date, Confirmed, Infected, Fatal and Recovered columns
+            model (covsirphy.ModelBase): ODE model
+
+        Returns:
+            covsirphy.PhaseUnit: the phase with the parameter values, RMSLE, trials, runtime and estimator
+        """
+        unit.set_ode(model=model, tau=entry["tau"], **entry["params"])
+        unit.est_dict.update({
+            cs.Term.RMSLE: entry["RMSLE"], cs.Term.TRIALS: entry["Trials"], cs.Term.RUNTIME: entry["Runtime"]})
+        unit.set_y0(record_df)
+        # The same as PhaseUnit.estimate(), which sets the estimator as a private attribute
+        unit._estimator = restore_estimator(
+            model, phase_records(record_df, unit.start_date, unit.end_date), unit.population,
+            entry["tau"], entry["params"], entry["RMSLE"])
+        return unit
+
+    def estimate_unit(self, unit, record_df, model, tau, country, province=None, **kwargs):
+        """
+        Perform parameter estimation of a phase, using the cache if available.
+
+        Args:
+            unit (covsirphy.PhaseUnit): the phase
+            record_df (pandas.DataFrame): records with Date, Confirmed, Infected, Fatal and Recovered columns
+            model (covsirphy.ModelBase): ODE model
+            tau (int): tau value [min]
+            country (str): country name
+            province (str or None): province name
+            kwargs: fixed parameter values of the model and keyword arguments of covsirphy.Estimator.run()
+
+        Returns:
+            bool: whether the cached result was used or not
+        """
+        (key, key_dict) = self.key(record_df, unit, model, tau, country, province=province, **kwargs)
+        entry = self.get(key)
+        if entry is not None:
+            self.restore(unit, entry, record_df, model)
+            return True
+        param_dict = {k: v for (k, v) in kwargs.items() if k in model.PARAMETERS}
+        unit.set_ode(model=model, tau=tau, **param_dict)
+        unit.estimate(record_df=record_df, **kwargs)
+        self.put(key, key_dict, unit, model)
+        return False
+
+    def _estimate_units(self, scenario, name, unit_dict, model, n_jobs, kwargs):
+        """
+        Perform parameter estimation of the phases with covsirphy.MPEstimator, using the cache if available.
+
+        Args:
+            scenario (covsirphy.Scenario): scenario
+            name (str): phase series name
+            unit_dict (dict(str, covsirphy.PhaseUnit)): phase names and the phases
+            model (covsirphy.ModelBase): ODE model
+            n_jobs (int): the number of parallel jobs or -1 (CPU count)
+            kwargs (dict(str, object)): fixed parameter values of the model and keyword arguments of Estimator.run()
+
+        Returns:
+            dict(str, bool): phase names and whether the cached results were used or not
+
+        Notes:
+            When scenario.tau is None, tau value will be estimated with the last phase and registered to the scenario.
+        """
+        record_df = scenario.record_df
+        key_dict, status_dict, missed = {}, {}, []
+        for (phase, unit) in unit_dict.items():
+            key_dict[phase] = self.key(
+                record_df, unit, model, scenario.tau, scenario.country, province=scenario.province, **kwargs)
+            entry = self.get(key_dict[phase][0])
+            if entry is None:
+                missed.append(phase)
+                continue
+            self.restore(unit, entry, record_df, model)
+            status_dict[phase] = True
+            if scenario.tau is None:
+                scenario.tau = entry["tau"]
+        if missed:
+            mp_estimator = cs.MPEstimator(record_df=record_df, model=model, tau=scenario.tau, **kwargs)
+            mp_estimator.add([unit_dict[phase] for phase in missed])
+            results = mp_estimator.run(n_jobs=n_jobs, **kwargs)
+            scenario.tau = mp_estimator.tau
+            scenario[name].replaces(phase=None, new_list=results, keep_old=True)
+            result_dict = {(unit.start_date, unit.end_date): unit for unit in results}
+            for phase in missed:
+                unit = result_dict[(unit_dict[phase].start_date, unit_dict[phase].end_date)]
+                self.put(*key_dict[phase], unit, model)
+                status_dict[phase] = False
+        return status_dict
+
+    def estimate(self, scenario, model, phases=None, name="Main", n_jobs=-1, **kwargs):
+        """
+        Estimate the parameters of the model like covsirphy.Scenario.estimate(), using the cache if available.
+
+        Args:
+            scenario (covsirphy.Scenario): scenario
+            model (covsirphy.ModelBase): ODE model
+            phases (list[str] or None): phase names, like 1st, 2nd..., or None (all past phases)
+            name (str): phase series name
+            n_jobs (int): the number of parallel jobs or -1 (CPU count)
+            kwargs: fixed parameter values of the model and keyword arguments of covsirphy.Estimator.run()
+
+        Raises:
+            KeyError: @phases includes un-registered phases or phases which are not past phases
+            ValueError: no past phases were registered
+
+        Returns:
+            dict(str, bool): phase names (keys) and whether the cached results were used or not (values)
+
+        Notes:
+            Only the phases whose keys were not cached will be estimated with covsirphy.MPEstimator.
+            When scenario.tau is None, tau value will be estimated with the last phase as Scenario.estimate() does.
+        """
+        if cs.Term.TAU in kwargs:
+            raise ValueError("@tau must be specified when scenario = Scenario(), and cannot be specified here.")
+        series = scenario[name]
+        unit_dict = {
+            cs.Term.num2str(num): unit for (num, unit) in enumerate(series)
+            if unit and unit <= scenario.last_date}
+        if not unit_dict:
+            raise ValueError("Scenario.trend(), Scenario.enable() or Scenario.add() must be done in advance.")
+        if phases is not None:
+            unknown = [phase for phase in phases if phase not in unit_dict]
+            if unknown:
+                raise KeyError(f"@phases must be selected from {', '.join(unit_dict)}, but {unknown} were included.")
+            unit_dict = {phase: unit_dict[phase] for phase in phases}
+        status_dict = {}
+        if scenario.tau is None:
+            # tau value will be estimated with the last phase, and the other phases will use it
+            last_phase = list(unit_dict)[-1]
+            status_dict.update(self._estimate_units(
+                scenario, name, {last_phase: unit_dict.pop(last_phase)}, model, n_jobs, kwargs))
+        if unit_dict:
+            status_dict.update(self._estimate_units(scenario, name, unit_dict, model, n_jobs, kwargs))
+        return status_dict
+
+    def info(self):
+        """
+        Return the statistics of the cache.
+
+        Returns:
+            dict[str, int]: hits, misses and entries
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(list(self.directory.glob("*.json")))}
+
+    def clear(self):
+        """
+        Remove the cached results.
+        """
+        for path in self.directory.glob("*.json"):
+            path.unlink()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import datetime
+import json
+import os
+from pathlib import Path
+import re
+import warnings
+from optuna.exceptions import ExperimentalWarning
+import covsirphy as cs
+from toolkit.estimate_cache import EstimationCache, phase_records
+
+
+def warm_estimate(unit, record_df, model, tau, param_dict, **kwargs):
+    """
+    Perform parameter estimation of a phase, starting with the previous parameter values.
+
+    Args:
+        unit (covsirphy.PhaseUnit): the phase
+        record_df (pandas.DataFrame): records with Date, Confirmed, Infected, Fatal and Recovered columns
+        model (covsirphy.ModelBase): ODE model
+        tau (int): tau value [min]
+        param_dict (dict(str, float)): the previous parameter values of the model
+        kwargs: fixed parameter values of the model and keyword arguments of covsirphy.Estimator.run()
+
+    Returns:
+        covsirphy.PhaseUnit: the phase with the estimated parameter values, RMSLE, trials, runtime and estimator
+
+    Notes:
+        The previous parameter values will be evaluated with the first trial,
+        and the following trials of Optuna will search around the best values.
+        When the estimator resets the study (the simulated values do not increase monotonically),
+        the previous values will not be used anymore.
+        Private APIs of covsirphy are used, refer to toolkit.estimate_cache.COVSIRPHY_VERSION.
+    """
+    fixed_dict = {k: v for (k, v) in kwargs.items() if k in model.PARAMETERS}
+    unit.set_ode(model=model, tau=tau, **fixed_dict)
+    window_df = phase_records(record_df, unit.start_date, unit.end_date)
+    estimator = cs.Estimator(window_df, model, unit.population, tau=tau, **fixed_dict)
+    estimator._init_study(seed=kwargs.get("seed", 0))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=ExperimentalWarning)
+        estimator.study.enqueue_trial(
+            {k: v for (k, v) in param_dict.items() if k in model.PARAMETERS and k not in fixed_dict})
+    estimator.run(**kwargs)
+    # The same as PhaseUnit.estimate()
+    unit._read_estimator(estimator, window_df)
+    unit._estimator = estimator
+    return unit
+
+
+class IncrementalScenario(object):
+    """
+    Update a scenario with new records, re-estimating only the phases whose records were changed.
+
+    Args:
+        population_data (covsirphy.PopulationData): population data
+        country (str): country name
+        province (str or None): province name
+        model (covsirphy.ModelBase): ODE model
+        tau (int or None): tau value [min], or None (estimated with the first update)
+        directory (str or pathlib.Path): directory to save the phases and parameter values of the last update
+        cache (toolkit.EstimationCache or None): cache of the results of parameter estimation,
+            or None (input/cache/estimation)
+
+    Notes:
+        With the first update, S-R trend analysis will be performed and all phases will be estimated.
+        With the following updates, the phases of the last update will be used and the last past phase
+        will be extended to the new last date without S-R trend analysis.
+        The phases whose records were not changed will be restored from the cache and the others
+        (usually the last past phase only) will be estimated again, starting with the previous parameter values.
+        The results of estimation with warm start will be cached separately with IncrementalScenario.NAMESPACE,
+        and they will not be used with full estimation (e.g. EstimationCache.estimate()).
+        Use update(full=True) to detect the phases again with S-R trend analysis (e.g. once a week).
+    """
+    STATE_VERSION = 1
+    # Namespace of the results of estimation with warm start in the cache
+    NAMESPACE = "warm_start"
+    # Status of the phases
+    CACHED = "cached"
+    REFIT = "refit"
+    ESTIMATED = "estimated"
+
+    def __init__(self, population_data, country, province=None, model=cs.SIRF, tau=None,
+                 directory="input/cache/incremental", cache=None):
+        self.population_data = population_data
+        self.country = country
+        self.province = province
+        self.model = model
+        self.tau = tau
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.cache = cache or EstimationCache()
+        area = country if province is None else f"{country}_{province}"
+        self.state_path = self.directory / f"{re.sub(r'[^0-9A-Za-z_-]', '_', area)}_{model.NAME}.json"
+        # Scenario of the last update
+        self.scenario = None
+
+    def _load_state(self):
+        """
+        Load the phases and parameter values of the last update.
+
+        Returns:
+            dict(str, object) or None: the state saved with _save_state() or None (not saved or invalid)
+        """
+        if not self.state_path.exists():
+            return None
+        with self.state_path.open("r") as fh:
+            state = json.load(fh)
+        if state.get("version") != self.STATE_VERSION or state.get("model") != self.model.NAME:
+            return None
+        if self.tau is not None and state.get("tau") != self.tau:
+            return None
+        return state
+
+    def _save_state(self, scenario, name):
+        """
+        Save the phases and parameter values of the scenario.
+
+        Args:
+            scenario (covsirphy.Scenario): scenario which finished parameter estimation
+            name (str): phase series name
+        """
+        phases = []
+        for unit in scenario[name]:
+            if not unit <= scenario.last_date:
+                continue
+            unit_dict = unit.to_dict()
+            phases.append({
+                "start_date": unit.start_date,
+                "end_date": unit.end_date,
+                "enabled": bool(unit),
+                "params": {
+                    param: float(unit_dict[param]) for param in self.model.PARAMETERS
+                    if unit_dict.get(param) not in (None, cs.Term.UNKNOWN)},
+            })
+        state = {
+            "version": self.STATE_VERSION,
+            "updated": datetime.datetime.now().isoformat(timespec="seconds"),
+            "model": self.model.NAME,
+            "tau": scenario.tau,
+            "first_date": scenario.first_date,
+            "last_date": scenario.last_date,
+            "phases": phases,
+        }
+        with open(f"{self.state_path}.tmp", "w") as fh:
+            json.dump(state, fh, indent=4)
+        os.replace(f"{self.state_path}.tmp", self.state_path)
+
+    def _is_reusable(self, state, scenario):
+        """
+        Return whether the phases of the last update can be used with the scenario or not.
+
+        Args:
+            state (dict(str, object) or None): the state of the last update
+            scenario (covsirphy.Scenario): scenario with new records
+
+        Returns:
+            bool: whether the phases can be used or not
+        """
+        if state is None or not state["phases"]:
+            return False
+        if state["first_date"] != scenario.first_date:
+            return False
+        last_date = cs.Term.date_obj(scenario.last_date)
+        return last_date >= cs.Term.date_obj(state["last_date"])
+
+    def _restore_phases(self, state, scenario, name):
+        """
+        Register the phases of the last update to the scenario, extending the last phase to the new last date.
+
+        Args:
+            state (dict(str, object)): the state of the last update
+            scenario (covsirphy.Scenario): scenario with new records
+            name (str): phase series name
+
+        Returns:
+            dict(str, dict(str, float)): start dates of the phases and the previous parameter values
+        """
+        series = scenario[name]
+        series.clear(include_past=True)
+        # The same as PhaseSeries.trend()
+        for phase_dict in state["phases"][:-1]:
+            series.add(end_date=phase_dict["end_date"])
+        series.add(end_date=scenario.last_date)
+        disabled = [
+            cs.Term.num2str(num) for (num, phase_dict) in enumerate(state["phases"]) if not phase_dict["enabled"]]
+        if disabled:
+            scenario.disable(phases=disabled, name=name)
+        return {phase_dict["start_date"]: phase_dict["params"] for phase_dict in state["phases"]}
+
+    def update(self, jhu_data, name="Main", full=False, n_jobs=-1, timeout=20, timeout_iteration=1, **kwargs):
+        """
+        Update the scenario with the records.
+
+        Args:
+            jhu_data (covsirphy.JHUData): case data, including the records of the last update and new records
+            name (str): phase series name
+            full (bool): whether perform S-R trend analysis and estimate all phases (without warm start) or not
+            n_jobs (int): the number of parallel jobs or -1 (CPU count), used when all phases will be estimated
+            timeout (int): time-out [sec] of estimation of a phase with warm start
+            timeout_iteration (int): time-out [sec] of one iteration of estimation with warm start
+            kwargs: fixed parameter values of the model and keyword arguments of covsirphy.Estimator.run()
+
+        Returns:
+            dict(str, str): phase names (keys) and status (values)
+                - "cached": the result of the last update was restored
+                - "refit": estimated with the previous parameter values as the first trial
+                - "estimated": estimated without the previous parameter values
+
+        Notes:
+            All phases will be estimated (with the cache) when @full is True, this is the first update,
+            the first date of the records was changed or records were removed.
+            Scenario.summary() and Scenario.track() can be used with IncrementalScenario.scenario.
+        """
+        state = self._load_state()
+        tau = self.tau if state is None else state["tau"]
+        scenario = cs.Scenario(jhu_data, self.population_data, country=self.country, province=self.province, tau=tau)
+        if full or not self._is_reusable(state, scenario):
+            scenario.tau = self.tau
+            scenario.trend(name=name, show_figure=False)
+            estimate_tau = scenario.tau is None
+            hit_dict = self.cache.estimate(scenario, self.model, name=name, n_jobs=n_jobs, **kwargs)
+            status_dict = {phase: self.CACHED if hit else self.ESTIMATED for (phase, hit) in hit_dict.items()}
+            # Register the results with the estimated tau value, which will be used with the following updates
+            # (results cached with tau=None, e.g. by Scenario scripts, will be registered too)
+            for (num, unit) in enumerate(scenario[name]):
+                if not estimate_tau or cs.Term.num2str(num) not in status_dict:
+                    continue
+                (key, key_dict) = self.cache.key(
+                    scenario.record_df, unit, self.model, scenario.tau, self.country, province=self.province,
+                    **kwargs)
+                if key not in self.cache:
+                    self.cache.put(key, key_dict, unit, self.model)
+        else:
+            param_dict = self._restore_phases(state, scenario, name)
+            record_df = scenario.record_df
+            refit_kwargs = {"timeout": timeout, "timeout_iteration": timeout_iteration, **kwargs}
+            status_dict = {}
+            for (num, unit) in enumerate(scenario[name]):
+                if not unit or not unit <= scenario.last_date:
+                    continue
+                phase = cs.Term.num2str(num)
+                # Results of full estimation are preferred to those of warm start
+                key_args = (record_df, unit, self.model, scenario.tau, self.country)
+                entry = self.cache.get(self.cache.key(*key_args, province=self.province, **kwargs)[0])
+                (key, key_dict) = self.cache.key(
+                    *key_args, province=self.province, namespace=self.NAMESPACE, **refit_kwargs)
+                entry = entry or self.cache.get(key)
+                if entry is not None:
+                    self.cache.restore(unit, entry, record_df, self.model)
+                    status_dict[phase] = self.CACHED
+                    continue
+                previous = param_dict.get(unit.start_date)
+                if previous:
+                    warm_estimate(unit, record_df, self.model, scenario.tau, previous, **refit_kwargs)
+                    self.cache.put(key, key_dict, unit, self.model)
+                    status_dict[phase] = self.REFIT
+                else:
+                    self.cache.estimate_unit(
+                        unit, record_df, self.model, scenario.tau, self.country, province=self.province, **kwargs)
+                    status_dict[phase] = self.ESTIMATED
+        self._save_state(scenario, name)
+        self.scenario = scenario
+        return status_dict
+
+    def save(self, directory, name="Main"):
+        """
+        Save the summary and the tracking data of the scenario as CSV files, replacing the files of the last update.
+
+        Args:
+            directory (str or pathlib.Path): directory to save "summary.csv" and "track.csv"
+            name (str): phase series name
+
+        Raises:
+            ValueError: IncrementalScenario.update() has not been done
+
+        Returns:
+            list[pathlib.Path]: the saved files
+
+        Notes:
+            The files will be replaced atomically and the other processes will not read incomplete files.
+        """
+        if self.scenario is None:
+            raise ValueError("IncrementalScenario.update() must be done in advance.")
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for (filename, df, index) in [
+                ("summary.csv", self.scenario.summary(name=name), True),
+                ("track.csv", self.scenario.track(), False)]:
+            path = directory / filename
+            df.to_csv(f"{path}.tmp", index=index)
+            os.replace(f"{path}.tmp", path)
+            paths.append(path)
+        return paths
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from pathlib import Path
+import sys
+import tempfile
+import covsirphy as cs
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from toolkit.data_cache import CachedDataLoader  # noqa: E402
+from toolkit.estimate_cache import EstimationCache  # noqa: E402
+from toolkit.incremental import IncrementalScenario  # noqa: E402
+
+
+def check_cached(jhu_data, population_data, country, directory, **kwargs):
+    """
+    Check that the second update with unchanged records restores all phases from the cache.
+
+    Args:
+        jhu_data (covsirphy.JHUData): case data
+        population_data (covsirphy.PopulationData): population data
+        country (str): country name
+        directory (str or pathlib.Path): directory of the cache and the state
+        kwargs: keyword arguments of covsirphy.Estimator.run(), except for timeout and timeout_iteration
+
+    Raises:
+        AssertionError: some phases were estimated with the second update
+
+    Returns:
+        list[dict(str, str)]: status of the phases with the first and the second update
+
+    Notes:
+        Before the updates, all phases will be estimated with tau=None as 07_scenario/scenario.py does,
+        sharing the cache with IncrementalScenario.
+        Because IncrementalScenario.update() uses @timeout and @timeout_iteration only with warm start,
+        the default values will be used with the estimation (this may take a few minutes).
+    """
+    cache = EstimationCache(Path(directory) / "estimation")
+    snl = cs.Scenario(jhu_data, population_data, country=country)
+    snl.trend(show_figure=False)
+    cache.estimate(snl, cs.SIRF, **kwargs)
+    results = []
+    for _ in range(2):
+        incremental = IncrementalScenario(
+            population_data, country=country, directory=Path(directory) / "incremental", cache=cache)
+        results.append(incremental.update(jhu_data, **kwargs))
+    estimated = {phase: status for (phase, status) in results[-1].items() if status != IncrementalScenario.CACHED}
+    assert not estimated, f"All phases must be restored from the cache, but {estimated} were estimated."
+    return results
+
+
+def main():
+    print(cs.__version__)
+    data_loader = CachedDataLoader("input")
+    japan_data = data_loader.japan()
+    jhu_data = cs.JHUData.from_dataframe(japan_data.cleaned())
+    population_data = data_loader.population(verbose=False)
+    with tempfile.TemporaryDirectory() as directory:
+        for status_dict in check_cached(jhu_data, population_data, "Japan", directory, stdout=False):
+            print(status_dict)
+
+
+if __name__ == "__main__":
+    main()
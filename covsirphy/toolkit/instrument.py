@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from contextlib import contextmanager
+import datetime
+import functools
+import json
+import os
+from pathlib import Path
+import resource
+import time
+import uuid
+import pandas as pd
+
+
+def _reset_peak_rss():
+    """
+    Reset peak RSS (VmHWM) of the current process.
+
+    Returns:
+        bool: whether peak RSS was reset or not
+
+    Notes:
+        Writing "5" to /proc/self/clear_refs resets VmHWM with Linux 4.0 or later.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as fh:
+            fh.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss():
+    """
+    Return peak RSS of the current process in bytes, the same as peak_rss() of python/03_egov/law_bench.py (MiB).
+
+    Returns:
+        int: peak RSS [byte]
+    """
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _count_rows(result):
+    """
+    Return the number of rows of the returned value of a stage.
+
+    Args:
+        result (object): returned value
+
+    Returns:
+        int or None: the number of rows of dataframes and datasets (covsirphy.CleaningBase), or None (unknown)
+    """
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return len(result)
+    cleaned_df = getattr(result, "_cleaned_df", None)
+    if isinstance(cleaned_df, pd.DataFrame):
+        return len(cleaned_df)
+    return None
+
+
+def _escape(value):
+    """
+    Escape a label value of Prometheus text format.
+
+    Args:
+        value (str): label value
+
+    Returns:
+        str: value with escaped backslashes, double quotes and line feeds
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Instrument(object):
+    """
+    Record wall time, CPU time, peak RSS and the number of rows of the stages of a pipeline.
+
+    Args:
+        job (str): name of the pipeline, like "estimate"
+        directory (str or pathlib.Path or None): directory to save "{job}.jsonl" and "{job}.prom",
+            or None (not saved)
+        labels (dict(str, str) or None): labels of all records, like {"country": "Japan"}
+        enabled (bool): whether record the stages or not
+
+    Notes:
+        CPU time of the worker processes (e.g. Scenario.estimate() with a process pool) will be recorded
+        as "children_cpu_sec" when the workers were joined in the stage.
+        Peak RSS is that of the stage when VmHWM could be reset (Linux), or that of the process.
+        With nested stages (e.g. a wrapped method calls another wrapped method), peak RSS of the inner stages
+        is that of the outermost stage so far.
+        When disabled, stage() and wrap() do nothing and the pipeline will not be changed.
+    """
+    METRICS = [
+        ("wall_sec", "covsirphy_stage_wall_seconds", "Wall time of the stage."),
+        ("cpu_sec", "covsirphy_stage_cpu_seconds", "CPU time of the stage in the main process."),
+        ("children_cpu_sec", "covsirphy_stage_children_cpu_seconds", "CPU time of the stage in the child processes."),
+        ("peak_rss_bytes", "covsirphy_stage_peak_rss_bytes", "Peak resident set size during the stage."),
+        ("rows", "covsirphy_stage_rows", "The number of rows returned by the last call of the stage."),
+        ("calls", "covsirphy_stage_calls", "The number of calls of the stage."),
+        ("errors", "covsirphy_stage_errors", "The number of failed calls of the stage."),
+    ]
+    # Keys of the records which are not labels
+    RESERVED = {
+        "time", "run_id", "job", "stage", "wall_sec", "cpu_sec", "children_cpu_sec",
+        "peak_rss_bytes", "peak_rss_scope", "rows", "error"}
+
+    def __init__(self, job, directory=None, labels=None, enabled=True):
+        self.job = job
+        self.directory = None if directory is None else Path(directory)
+        self.labels = dict(labels or {})
+        self.enabled = enabled
+        self.run_id = uuid.uuid4().hex
+        self._records = []
+        self._depth = 0
+        # The number of records which have been saved as JSON lines
+        self._n_saved = 0
+
+    @classmethod
+    def from_env(cls, job, labels=None, variable="COVSIRPHY_METRICS_DIR"):
+        """
+        Create an instance which is enabled only when the environment variable is set.
+
+        Args:
+            job (str): name of the pipeline, like "estimate"
+            labels (dict(str, str) or None): labels of all records, like {"country": "Japan"}
+            variable (str): name of the environment variable which indicates the directory to save the records
+
+        Returns:
+            Instrument: instance
+        """
+        directory = os.environ.get(variable)
+        return cls(job, directory=directory, labels=labels, enabled=bool(directory))
+
+    @contextmanager
+    def stage(self, name, **labels):
+        """
+        Record a stage with "with" statement.
+
+        Args:
+            name (str): name of the stage, like "estimate"
+            labels (str): labels of the record
+
+        Yields:
+            dict(str, object): the record, "rows" (int or None) can be set in the block
+
+        Notes:
+            Exceptions raised in the block will be recorded as "error" and re-raised.
+        """
+        record = {"rows": None}
+        if not self.enabled:
+            yield record
+            return
+        if self._depth:
+            scope = "outer"
+        else:
+            scope = "stage" if _reset_peak_rss() else "process"
+        self._depth += 1
+        children_start = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        error = None
+        try:
+            yield record
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self._depth -= 1
+            wall_sec = time.perf_counter() - wall_start
+            cpu_sec = time.process_time() - cpu_start
+            children_end = resource.getrusage(resource.RUSAGE_CHILDREN)
+            rows = record.pop("rows")
+            record.update({
+                "time": datetime.datetime.now().isoformat(timespec="seconds"),
+                "run_id": self.run_id,
+                "job": self.job,
+                "stage": name,
+                **self.labels,
+                **labels,
+                "wall_sec": wall_sec,
+                "cpu_sec": cpu_sec,
+                "children_cpu_sec": (children_end.ru_utime + children_end.ru_stime)
+                - (children_start.ru_utime + children_start.ru_stime),
+                "peak_rss_bytes": _peak_rss(),
+                "peak_rss_scope": scope,
+                "rows": rows,
+                "error": error,
+            })
+            self._records.append(record)
+
+    def call(self, name, function, *args, rows=None, **kwargs):
+        """
+        Call a function as a stage.
+
+        Args:
+            name (str): name of the stage
+            function (callable): function to call
+            args (object): positional arguments of the function
+            rows (callable or None): function which receives the returned value and returns the number of rows,
+                or None (the length of dataframes and datasets)
+            kwargs (object): keyword arguments of the function
+
+        Returns:
+            object: the returned value of the function
+        """
+        with self.stage(name) as record:
+            result = function(*args, **kwargs)
+            record["rows"] = (rows or _count_rows)(result) if self.enabled else None
+        return result
+
+    def wrap(self, obj, names, rows=None):
+        """
+        Record the calls of the methods of an instance, replacing them with wrappers.
+
+        Args:
+            obj (object): instance, like covsirphy.Scenario and covsirphy.DataLoader
+            names (list[str]): names of the methods, which will be used as the names of the stages
+            rows (dict(str, callable) or None): names of the methods (keys) and functions to return the number
+                of rows with the returned values (values)
+
+        Returns:
+            object: @obj
+
+        Notes:
+            The wrappers will be set as the attributes of the instance and the class will not be changed.
+        """
+        if not self.enabled:
+            return obj
+        rows = rows or {}
+        for name in names:
+            method = getattr(obj, name)
+
+            @functools.wraps(method)
+            def wrapper(*args, _name=name, _method=method, **kwargs):
+                return self.call(_name, _method, *args, rows=rows.get(_name), **kwargs)
+
+            setattr(obj, name, wrapper)
+        return obj
+
+    def records(self):
+        """
+        Return the records of the stages.
+
+        Returns:
+            pandas.DataFrame: records
+                Index:
+                    reset index
+                Columns:
+                    - time (str): end time of the stage
+                    - run_id (str): ID of the instance
+                    - job (str): name of the pipeline
+                    - stage (str): name of the stage
+                    - labels of the records
+                    - wall_sec (float): wall time [sec]
+                    - cpu_sec (float): CPU time [sec] in the main process
+                    - children_cpu_sec (float): CPU time [sec] in the child processes
+                    - peak_rss_bytes (int): peak RSS [byte]
+                    - peak_rss_scope (str): "stage", "outer" (nested stage) or "process" (peak RSS could not be reset)
+                    - rows (int or None): the number of rows
+                    - error (str or None): name of the exception
+        """
+        return pd.DataFrame(self._records)
+
+    def _aggregate(self):
+        """
+        Aggregate the records by stage.
+
+        Returns:
+            dict(tuple(tuple(str, str)), dict(str, float)): labels (keys) and values of the metrics (values)
+        """
+        metric_dict = {}
+        for record in self._records:
+            label_dict = {"job": self.job, "stage": record["stage"]}
+            label_dict.update({k: str(record[k]) for k in record.keys() - self.RESERVED})
+            key = tuple(sorted(label_dict.items()))
+            values = metric_dict.setdefault(
+                key, {"wall_sec": 0, "cpu_sec": 0, "children_cpu_sec": 0, "peak_rss_bytes": 0, "calls": 0, "errors": 0})
+            for name in ["wall_sec", "cpu_sec", "children_cpu_sec"]:
+                values[name] += record[name]
+            values["peak_rss_bytes"] = max(values["peak_rss_bytes"], record["peak_rss_bytes"])
+            values["calls"] += 1
+            values["errors"] += record["error"] is not None
+            if record["rows"] is not None:
+                values["rows"] = record["rows"]
+        return metric_dict
+
+    def prometheus(self):
+        """
+        Return the metrics of the stages in the text format of Prometheus.
+
+        Returns:
+            str: metrics, the sum of time, max of peak RSS and the number of calls by stage
+        """
+        metric_dict = self._aggregate()
+        lines = []
+        for (key, metric, description) in self.METRICS:
+            lines.extend([f"# HELP {metric} {description}", f"# TYPE {metric} gauge"])
+            for (label_items, values) in metric_dict.items():
+                if key not in values:
+                    continue
+                labels = ",".join(f'{k}="{_escape(v)}"' for (k, v) in label_items)
+                lines.append(f"{metric}{{{labels}}} {values[key]}")
+        lines.extend([
+            "# HELP covsirphy_run_timestamp_seconds Unix time when the metrics were saved.",
+            "# TYPE covsirphy_run_timestamp_seconds gauge",
+            f'covsirphy_run_timestamp_seconds{{job="{self.job}"}} {time.time()}',
+        ])
+        return "\n".join(lines) + "\n"
+
+    def save(self, directory=None):
+        """
+        Save the new records as JSON lines (appended to "{job}.jsonl")
+        and the metrics of all records as Prometheus textfile ("{job}.prom").
+
+        Args:
+            directory (str or pathlib.Path or None): directory to save the files,
+                or None (the directory of the instance)
+
+        Returns:
+            list[pathlib.Path]: the saved files (empty when disabled or the directory was not specified)
+
+        Notes:
+            The textfile will be replaced atomically so that the textfile collector of node_exporter
+            does not read incomplete files.
+        """
+        directory = self.directory if directory is None else Path(directory)
+        if not self.enabled or directory is None:
+            return []
+        directory.mkdir(parents=True, exist_ok=True)
+        json_path = directory / f"{self.job}.jsonl"
+        with json_path.open("a", encoding="utf-8") as fh:
+            for record in self._records[self._n_saved:]:
+                fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._n_saved = len(self._records)
+        prom_path = directory / f"{self.job}.prom"
+        with open(f"{prom_path}.tmp", "w", encoding="utf-8") as fh:
+            fh.write(self.prometheus())
+        os.replace(f"{prom_path}.tmp", prom_path)
+        return [json_path, prom_path]
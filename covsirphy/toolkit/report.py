@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+import pickle
+import covsirphy as cs
+
+
+def _init_worker():
+    """
+    Use non-interactive backend of matplotlib in the worker process.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _render_markdown(df, filename):
+    """
+    Save a dataframe as a markdown table.
+
+    Args:
+        df (pandas.DataFrame): dataframe
+        filename (str): filename to save
+    """
+    with open(filename, "w") as fh:
+        fh.write(df.to_markdown())
+
+
+def _render_line_plot(df, filename, kwargs):
+    """
+    Save a line plot of a dataframe.
+
+    Args:
+        df (pandas.DataFrame): dataframe
+        filename (str): filename to save
+        kwargs (dict(str, object)): keyword arguments of covsirphy.line_plot()
+    """
+    cs.line_plot(df, filename=filename, **kwargs)
+
+
+def _render_accuracy(estimator, filename):
+    """
+    Save the accuracy of parameter estimation as a figure.
+
+    Args:
+        estimator (covsirphy.Estimator): estimator of a phase
+        filename (str): filename to save
+    """
+    estimator.accuracy(filename=filename)
+
+
+class Report(object):
+    """
+    Collect figures and markdown tables of a scenario as jobs and render them with a process pool.
+
+    Args:
+        scenario (covsirphy.Scenario): scenario to report
+        max_workers (int or None): the number of worker processes, or None (CPU count)
+
+    Notes:
+        Summary and track of the scenario will be calculated only once at the first use
+        and they will be shared by the jobs. Scenario must not be changed after the first use.
+        Jobs which cannot be sent to the worker processes will be rendered in the main process.
+    """
+
+    def __init__(self, scenario, max_workers=None):
+        if not isinstance(scenario, cs.Scenario):
+            raise TypeError(f"@scenario must be an instance of covsirphy.Scenario, but {scenario} was applied.")
+        self.scenario = scenario
+        self.max_workers = max_workers or os.cpu_count()
+        # {name: summary dataframe}, name is None (all phase series) or phase series name
+        self._summary_dict = {}
+        self._track_df = None
+        # list of (function, arguments, filename)
+        self._jobs = []
+
+    def summary(self, columns=None, name=None):
+        """
+        Return the summary of the scenario, calculating it only at the first call for the phase series.
+
+        Args:
+            columns (list[str] or None): columns to show, or None (all columns)
+            name (str or None): phase series name, or None (all phase series)
+
+        Raises:
+            KeyError: un-registered columns were selected
+
+        Returns:
+            pandas.DataFrame: the same as covsirphy.Scenario.summary()
+        """
+        if name not in self._summary_dict:
+            self._summary_dict[name] = self.scenario.summary(name=name)
+        df = self._summary_dict[name]
+        if columns is None:
+            return df
+        if not set(columns).issubset(df.columns):
+            raise KeyError(
+                f"Un-registered columns were selected as @columns. Please use {', '.join(df.columns)}.")
+        return df.loc[:, columns]
+
+    def track(self):
+        """
+        Return values of parameters and variables, calculating them only at the first call.
+
+        Returns:
+            pandas.DataFrame: the same as covsirphy.Scenario.track()
+        """
+        if self._track_df is None:
+            self._track_df = self.scenario.track()
+        return self._track_df
+
+    def add(self, function, args, filename):
+        """
+        Add a job.
+
+        Args:
+            function (function): module-level function to render an output, which accepts @args
+            args (tuple(object)): positional arguments of the function
+            filename (str): filename of the output
+
+        Returns:
+            Report: self
+        """
+        self._jobs.append((function, tuple(args), filename))
+        return self
+
+    def markdown(self, df, filename):
+        """
+        Add a job to save a dataframe as a markdown table.
+
+        Args:
+            df (pandas.DataFrame): dataframe
+            filename (str): filename to save
+
+        Returns:
+            Report: self
+        """
+        return self.add(_render_markdown, (df, filename), filename)
+
+    def table(self, filename, columns=None, name=None):
+        """
+        Add a job to save the summary as a markdown table.
+
+        Args:
+            filename (str): filename to save
+            columns (list[str] or None): columns to show, or None (all columns)
+            name (str or None): phase series name, or None (all phase series)
+
+        Returns:
+            Report: self
+        """
+        return self.markdown(self.summary(columns=columns, name=name), filename)
+
+    def history(self, target, filename):
+        """
+        Add a job to save the history of a variable or a parameter as a figure, like covsirphy.Scenario.history().
+
+        Args:
+            target (str): parameter or variable to show (Rt etc.)
+            filename (str): filename to save
+
+        Raises:
+            KeyError: @target is not included in the track of the scenario
+
+        Returns:
+            Report: self
+        """
+        df = self.track()
+        if target not in df.columns:
+            raise KeyError(
+                f"@target must be selected from {', '.join(df.columns)}, but {target} was applied.")
+        df = df.pivot_table(values=target, index=cs.Term.DATE, columns=cs.Term.SERIES, aggfunc="last")
+        change_dates = [unit.start_date for unit in self.scenario["Main"]][1:]
+        kwargs = {
+            "title": f"{self.scenario.area}: {target} over time", "ylabel": target,
+            "h": 1.0 if target == cs.Term.RT else None, "v": change_dates, "math_scale": False,
+        }
+        return self.add(_render_line_plot, (df, filename, kwargs), filename)
+
+    def accuracy(self, phase, filename, name="Main"):
+        """
+        Add a job to save the accuracy of parameter estimation as a figure.
+
+        Args:
+            phase (str): phase name, like 1st, 2nd...
+            filename (str): filename to save
+            name (str): phase series name
+
+        Returns:
+            Report: self
+        """
+        estimator = self.scenario.phase_estimator(phase=phase, name=name)
+        return self.add(_render_accuracy, (estimator, filename), filename)
+
+    def render(self):
+        """
+        Render the outputs of the jobs and clear the jobs.
+
+        Returns:
+            list[str]: filenames of the outputs
+        """
+        jobs, self._jobs = self._jobs, []
+        local_jobs, futures = [], []
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker) as executor:
+            for (function, args, _) in jobs:
+                try:
+                    pickle.dumps(args)
+                except (pickle.PicklingError, TypeError, AttributeError):
+                    local_jobs.append((function, args))
+                    continue
+                futures.append(executor.submit(function, *args))
+            # Render the outputs which cannot be sent to the workers while the workers are running
+            for (function, args) in local_jobs:
+                function(*args)
+            for future in futures:
+                future.result()
+        return [filename for (_, _, filename) in jobs]
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+import covsirphy as cs
+
+
+def _vectorized_model(model, values):
+    """
+    Create an instance of the model whose population and parameters are arrays.
+
+    Args:
+        model (covsirphy.ModelBase): ODE model
+        values (numpy.ndarray): rows of (population, parameter values in the order of model.PARAMETERS)
+
+    Returns:
+        covsirphy.ModelBase: instance of the model, which returns derivatives of all rows at once
+
+    Notes:
+        The right-hand sides of ODE models (ModelBase.__call__()) consist of element-wise operations
+        and they can be applied to the arrays of variables with shape (the number of variables, the number of rows).
+    """
+    instance = model(population=1, **{param: 0 for param in model.PARAMETERS})
+    instance.population = values[:, 0]
+    for (i, param) in enumerate(model.PARAMETERS, start=1):
+        setattr(instance, param, values[:, i])
+    return instance
+
+
+def _initial_values(model, population, y0):
+    """
+    Return initial values of the variables.
+
+    Args:
+        model (covsirphy.ModelBase): ODE model
+        population (numpy.ndarray): total population of the rows
+        y0 (array-like or None): rows of initial values in the order of model.VARIABLES,
+            or None (model.EXAMPLE["y0_dict"] except for Susceptible, which is population minus the others)
+
+    Raises:
+        ValueError: the shape of @y0 is not (the number of rows, the number of variables)
+
+    Returns:
+        numpy.ndarray: initial values with shape (the number of variables, the number of rows)
+    """
+    n_vars, n_rows = len(model.VARIABLES), len(population)
+    if y0 is None:
+        eg_dict = model.EXAMPLE["y0_dict"]
+        values = np.empty((n_vars, n_rows))
+        for (i, variable) in enumerate(model.VARIABLES):
+            values[i] = eg_dict[variable]
+        values[0] = population - values[1:].sum(axis=0)
+        return values
+    values = np.asarray(y0, dtype=np.float64)
+    if values.shape != (n_rows, n_vars):
+        raise ValueError(
+            f"The shape of @y0 must be ({n_rows}, {n_vars}), but {values.shape} was applied.")
+    return values.T.copy()
+
+
+def simulate_batch(model, params, step_n=180, tau=1440, start_date="22Jan2020", y0=None,
+                   country=None, provinces=None, substeps=4):
+    """
+    Simulate ODE model with many sets of population and parameter values at once.
+
+    Args:
+        model (covsirphy.ModelBase): ODE model, like covsirphy.SIR and covsirphy.SIRF
+        params (pandas.DataFrame or array-like): population and parameter values
+            - pandas.DataFrame: columns are "population" and model.PARAMETERS
+            - array-like: rows of (population, parameter values in the order of model.PARAMETERS)
+        step_n (int): the number of steps
+        tau (int): tau value [min]
+        start_date (str): start date of the records, like 22Jan2020
+        y0 (array-like or None): rows of initial values in the order of model.VARIABLES,
+            or None (model.EXAMPLE["y0_dict"] except for Susceptible, which is population minus the others)
+        country (str or None): country name, or None (model name)
+        provinces (list[str] or None): province names of the rows, or None (row numbers, like "0", "1")
+        substeps (int): the number of Runge-Kutta steps in a step
+
+    Raises:
+        ValueError: the shapes of the arguments do not match
+
+    Returns:
+        pandas.DataFrame: records of the rows in order, the same columns as covsirphy.ExampleData.specialized()
+            Index:
+                reset index
+            Columns:
+                - Date (pd.TimeStamp): Observation date
+                - Country (str): country name
+                - Province (str): province name, which indicates the row of @params
+                - variables of the model (int)
+
+    Notes:
+        ODE will be solved with classical 4th-order Runge-Kutta method with fixed step size (1 / @substeps),
+        and the derivatives of all rows will be calculated with one call of the model in each stage.
+        covsirphy.ODESimulator uses scipy.integrate.solve_ivp() with the default tolerance (RK45, rtol=1e-3)
+        for each row, and the values will be different from those of ExampleData.add() within its error.
+        With @substeps=4, the difference from solve_ivp(rtol=1e-10) was 1 person or less with SIR-F model.
+    """
+    columns = ["population", *model.PARAMETERS]
+    if isinstance(params, pd.DataFrame):
+        values = params.loc[:, columns].to_numpy(dtype=np.float64)
+    else:
+        values = np.atleast_2d(np.asarray(params, dtype=np.float64))
+    if values.ndim != 2 or values.shape[1] != len(columns):
+        raise ValueError(f"@params must have {len(columns)} columns ({', '.join(columns)}).")
+    if (values[:, 0] <= 0).any():
+        raise ValueError("Population values of @params must be positive.")
+    n_rows = len(values)
+    provinces = [str(i) for i in range(n_rows)] if provinces is None else list(provinces)
+    if len(provinces) != n_rows:
+        raise ValueError(f"@provinces must have {n_rows} names, but {len(provinces)} names were applied.")
+    instance = _vectorized_model(model, values)
+    X = _initial_values(model, values[:, 0], y0)
+    # Solve ODE: results with shape (the number of steps + 1, the number of variables, the number of rows)
+    h = 1 / substeps
+    results = np.empty((step_n + 1, *X.shape))
+    results[0] = X
+    for step in range(step_n):
+        for sub in range(substeps):
+            t = step + sub * h
+            k1 = instance(t, X)
+            k2 = instance(t + h / 2, X + h / 2 * k1)
+            k3 = instance(t + h / 2, X + h / 2 * k2)
+            k4 = instance(t + h, X + h * k3)
+            X = X + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        results[step + 1] = X
+    # Long-format dataframe: (rows, steps, variables)
+    n_steps = step_n + 1
+    records = np.rint(results.transpose(2, 0, 1).reshape(n_rows * n_steps, -1)).astype(np.int64)
+    dates = pd.to_datetime(start_date, format=cs.Term.DATE_FORMAT) + pd.to_timedelta(
+        np.arange(n_steps) * tau, unit="min")
+    df = pd.DataFrame(records, columns=model.VARIABLES)
+    df.insert(0, cs.Term.DATE, np.tile(dates.to_numpy(), n_rows))
+    df.insert(1, cs.Term.COUNTRY, country or model.NAME)
+    df.insert(2, cs.Term.PROVINCE, np.repeat(np.array(provinces, dtype=object), n_steps))
+    return df
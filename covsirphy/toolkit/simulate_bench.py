@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from pathlib import Path
+import sys
+import time
+import numpy as np
+import pandas as pd
+import covsirphy as cs
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from toolkit.simulate import simulate_batch  # noqa: E402
+
+
+def random_params(model, n, seed=0):
+    """
+    Return random sets of population and parameter values.
+
+    Args:
+        model (covsirphy.ModelBase): ODE model
+        n (int): the number of sets
+        seed (int): random seed
+
+    Returns:
+        pandas.DataFrame: columns are "population" and model.PARAMETERS
+    """
+    rng = np.random.default_rng(seed)
+    ranges = {"theta": (0, 0.01), "kappa": (0, 0.01), "rho": (0.05, 0.4), "sigma": (0.01, 0.1)}
+    param_dict = {param: rng.uniform(*ranges[param], size=n) for param in model.PARAMETERS}
+    return pd.DataFrame({"population": model.EXAMPLE["population"], **param_dict})
+
+
+def simulate_loop(model, params, step_n=180, tau=1440, start_date="22Jan2020"):
+    """
+    Simulate ODE model with ExampleData.add() for each set of parameter values.
+
+    Args:
+        model (covsirphy.ModelBase): ODE model
+        params (pandas.DataFrame): columns are "population" and model.PARAMETERS
+        step_n (int): the number of steps
+        tau (int): tau value [min]
+        start_date (str): start date of the records, like 22Jan2020
+
+    Returns:
+        pandas.DataFrame: the same as simulate_batch()
+    """
+    example_data = cs.ExampleData(tau=tau, start_date=start_date)
+    dataframes = []
+    for (i, row) in enumerate(params.itertuples(index=False)):
+        area = {"country": model.NAME, "province": str(i)}
+        param_dict = {param: getattr(row, param) for param in model.PARAMETERS}
+        example_data.add(model, step_n=step_n, population=int(row.population), param_dict=param_dict, **area)
+        dataframes.append(example_data.specialized(model, **area))
+    return pd.concat(dataframes, axis=0, ignore_index=True)
+
+
+def bench(model, n, n_loop=100):
+    """
+    Compare the batched simulator with the per-call loop.
+
+    Args:
+        model (covsirphy.ModelBase): ODE model
+        n (int): the number of sets of parameter values
+        n_loop (int): the number of sets simulated with the loop, which will be scaled to @n
+
+    Returns:
+        dict(str, object): the number of sets, elapsed time [sec] and max difference of the values
+    """
+    params = random_params(model, n)
+    start = time.perf_counter()
+    batch_df = simulate_batch(model, params)
+    batch_sec = time.perf_counter() - start
+    start = time.perf_counter()
+    loop_df = simulate_loop(model, params.iloc[:n_loop])
+    loop_sec = (time.perf_counter() - start) * n / n_loop
+    diff = (batch_df.iloc[:len(loop_df)][model.VARIABLES] - loop_df[model.VARIABLES]).abs().to_numpy()
+    return {
+        "model": model.NAME, "sets": n, "loop [sec] (estimated)": loop_sec, "batch [sec]": batch_sec,
+        "max difference": int(diff.max()), "max difference [%]": float((diff / model.EXAMPLE["population"]).max() * 100),
+    }
+
+
+def main():
+    print(cs.__version__)
+    df = pd.DataFrame([bench(model, n=2000) for model in [cs.SIR, cs.SIRF]])
+    print(df.to_markdown(index=False))
+
+
+if __name__ == "__main__":
+    main()
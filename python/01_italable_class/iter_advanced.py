@@ -1,11 +1,14 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import numpy as np
+
 
 class Unit(object):
     """
     The smallest unit.
     """
+    __slots__ = ("_value", "_enabled")
 
     def __init__(self, value):
         if not isinstance(value, (float, int)):
@@ -37,30 +40,312 @@ class Unit(object):
         self._enabled = False
 
 
+class UnitView(object):
+    """
+    Lightweight proxy of a unit registered in a series, which has the same interface as Unit.
+    The value and the state are read from/written to the arrays of the series.
+
+    Args:
+        series (Series): the series
+        index (int): index number of the unit in the series
+
+    Notes:
+        This is not a subclass of Unit and does not have the slots of Unit.
+    """
+    __slots__ = ("_series", "_index")
+
+    def __init__(self, series, index):
+        self._series = series
+        self._index = index
+
+    def __bool__(self):
+        return bool(self._series._enabled[self._index])
+
+    @property
+    def value(self):
+        """
+        float: value of the unit
+        """
+        return self._series._values[self._index].item()
+
+    def enable(self):
+        """
+        Enable the unit.
+        """
+        self._series.enable(self._index)
+
+    def disable(self):
+        """
+        Disable the unit.
+        """
+        self._series.disable(self._index)
+
+
 class Series(object):
     """
     A series of units.
+
+    Args:
+        capacity (int): the initial number of units which can be registered without re-allocation
+
+    Notes:
+        Values are saved in a contiguous NumPy array (int64, or float64 when float values are registered)
+        and enabled/disabled states are saved in a boolean array.
+        Iteration yields UnitView instances, which are proxies of the units in the series.
+        The number and the sum of enabled values are updated with changes of states,
+        and sorted index numbers of enabled units are updated with the changes when requested.
+        The sum of float values may include rounding errors of the updates.
+        The sum of integer values is exact while the sum of the values changed at once (with add(), extend(),
+        enable() or disable()) is within the range of int64 (-2**63 to 2**63 - 1), it wraps around otherwise.
+        Breaking change: units are not kept in the series but their values and states are copied with add(),
+        and enable()/disable() of the original Unit instances do not change the series.
+        Use the UnitView instances returned with iteration or indexing (e.g. series[0].disable()).
     """
+    # Range of integer values
+    INT_MIN = np.iinfo(np.int64).min
+    INT_MAX = np.iinfo(np.int64).max
+
+    def __init__(self, capacity=16):
+        if not isinstance(capacity, int):
+            raise TypeError(
+                f"@capacity must be integer, but {capacity} was applied.")
+        self._values = np.empty(max(capacity, 1), dtype=np.int64)
+        self._enabled = np.empty(max(capacity, 1), dtype=np.bool_)
+        self._size = 0
+        self._n_enabled = 0
+        self._enabled_sum = 0
+        # Sorted index numbers of enabled units and index numbers changed after the last update of them
+        self._enabled_idx = np.array([], dtype=np.int64)
+        self._pending = []
+        self._n_pending = 0
+        # Whether the index numbers of enabled units will be re-computed with the states or not
+        self._stale = False
 
-    def __init__(self):
-        self._units = []
+    def __len__(self):
+        return self._size
 
     def __iter__(self):
-        yield from self._units
+        for num in range(self._size):
+            yield UnitView(self, num)
+
+    def __getitem__(self, num):
+        self._validate_index(num)
+        return UnitView(self, num % self._size)
+
+    def _reserve(self, size, dtype):
+        """
+        Re-allocate the arrays if necessary.
+
+        Args:
+            size (int): the number of units to be registered
+            dtype (numpy.dtype): data type of the values to be registered
+        """
+        new_dtype = np.promote_types(self._values.dtype, dtype)
+        capacity = len(self._values)
+        if size <= capacity and new_dtype == self._values.dtype:
+            return
+        while capacity < size:
+            capacity *= 2
+        values = np.empty(capacity, dtype=new_dtype)
+        values[:self._size] = self._values[:self._size]
+        enabled = np.empty(capacity, dtype=np.bool_)
+        enabled[:self._size] = self._enabled[:self._size]
+        self._values, self._enabled = values, enabled
 
     def add(self, unit):
         """
         Append a unit.
 
         Args:
-            unit (Unit]): the smallest unit
+            unit (Unit or UnitView): the smallest unit or a unit registered in a series
+
+        Raises:
+            TypeError: unit is not an instance of Unit or UnitView
+            ValueError: the value of the unit is an integer out of the range of int64
+
+        Notes:
+            The value and the state of the unit will be copied to the series (breaking change),
+            and enable()/disable() of @unit after that do not change the series.
+        """
+        if not isinstance(unit, (Unit, UnitView)):
+            raise TypeError("@unit must be a instance of Unit or UnitView")
+        if isinstance(unit.value, int) and not self.INT_MIN <= unit.value <= self.INT_MAX:
+            raise ValueError(
+                f"@unit must have a value from {self.INT_MIN} to {self.INT_MAX}, but {unit.value} was applied.")
+        self._reserve(self._size + 1, np.float64 if isinstance(unit.value, float) else np.int64)
+        self._values[self._size] = unit.value
+        self._enabled[self._size] = False
+        self._size += 1
+        if unit:
+            self._set_states(np.array([self._size - 1]), True)
+
+    def extend(self, values, enabled=True):
+        """
+        Append units with their values at once.
+
+        Args:
+            values (list[int/float] or numpy.ndarray): values of the units
+            enabled (bool): whether the units are enabled or not
 
         Raises:
-            TypeError: unit is not an instance of Unit
+            TypeError: @values includes non-numeric values
+            ValueError: @values includes unsigned integers out of the range of int64
         """
-        if not isinstance(unit, Unit):
-            raise TypeError("@unit must be a instance of Unit")
-        self._units.append(unit)
+        array = np.asarray(values)
+        if array.dtype == np.bool_ or not np.issubdtype(array.dtype, np.number):
+            raise TypeError(
+                f"@values must be integer or float values, but {values} was applied.")
+        array = array.ravel()
+        if np.issubdtype(array.dtype, np.unsignedinteger) and len(array) and array.max() > self.INT_MAX:
+            raise ValueError(
+                f"@values must be from {self.INT_MIN} to {self.INT_MAX}, but {array.max()} was included.")
+        dtype = np.float64 if np.issubdtype(array.dtype, np.floating) else np.int64
+        self._reserve(self._size + len(array), dtype)
+        self._values[self._size: self._size + len(array)] = array
+        self._enabled[self._size: self._size + len(array)] = False
+        self._size += len(array)
+        if enabled:
+            self._set_states(np.arange(self._size - len(array), self._size), True)
+
+    @property
+    def values(self):
+        """
+        numpy.ndarray: read-only view of the values of all units
+        """
+        view = self._values[:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def mask(self):
+        """
+        numpy.ndarray: read-only view of the states of all units, True (enabled) or False (disabled)
+        """
+        view = self._enabled[:self._size]
+        view.flags.writeable = False
+        return view
+
+    def iter_chunks(self, size):
+        """
+        Return values and states in batches without copying.
+
+        Args:
+            size (int): the number of units in a batch
+
+        Raises:
+            TypeError: @size is not an integer
+            ValueError: @size is under 1
+
+        Yields:
+            tuple(numpy.ndarray, numpy.ndarray): read-only views of values and states (True: enabled) in a batch
+
+        Notes:
+            The last batch may be shorter than @size.
+        """
+        if not isinstance(size, int):
+            raise TypeError(
+                f"@size must be integer, but {size} was applied.")
+        if size < 1:
+            raise ValueError(
+                f"@size must be over 0, but {size} was applied.")
+        (values, mask) = (self.values, self.mask)
+        for start in range(0, self._size, size):
+            yield (values[start: start + size], mask[start: start + size])
+
+    def enabled_view(self):
+        """
+        Return the values as a masked array, where disabled units are masked, without copying the values.
+
+        Returns:
+            numpy.ma.MaskedArray: the values of enabled units
+        """
+        return np.ma.MaskedArray(self.values, mask=~self.mask, copy=False)
+
+    @property
+    def n_enabled(self):
+        """
+        int: the number of enabled units
+        """
+        return self._n_enabled
+
+    @property
+    def enabled_sum(self):
+        """
+        int or float: the sum of the values of enabled units (integer sum may wrap around, refer to Series)
+        """
+        return self._enabled_sum
+
+    def enabled_indices(self):
+        """
+        Return the index numbers of enabled units.
+
+        Returns:
+            numpy.ndarray: read-only sorted index numbers
+
+        Notes:
+            Computational cost is proportional to the number of enabled units and changes after the last call.
+            When more than 1/8 of the units were changed, the index numbers will be re-computed with the states.
+        """
+        if self._stale:
+            self._enabled_idx = np.flatnonzero(self._enabled[:self._size])
+        elif self._pending:
+            idx = self._enabled_idx
+            changed = np.unique(np.concatenate(self._pending))
+            pos = np.searchsorted(idx, changed)
+            registered = np.zeros(len(changed), dtype=np.bool_)
+            if len(idx):
+                registered = idx[np.minimum(pos, len(idx) - 1)] == changed
+            states = self._enabled[changed]
+            idx = np.delete(idx, pos[registered & ~states])
+            added = changed[~registered & states]
+            self._enabled_idx = np.insert(idx, np.searchsorted(idx, added), added)
+        (self._pending, self._n_pending, self._stale) = ([], 0, False)
+        view = self._enabled_idx[:]
+        view.flags.writeable = False
+        return view
+
+    def enabled_values(self):
+        """
+        Return the values of enabled units.
+
+        Returns:
+            numpy.ndarray: the values of enabled units
+        """
+        return self._values[self.enabled_indices()]
+
+    def iter_enabled(self):
+        """
+        Iterate enabled units.
+
+        Yields:
+            UnitView: proxies of enabled units
+        """
+        for num in self.enabled_indices().tolist():
+            yield UnitView(self, num)
+
+    def iter_enabled_chunks(self, size):
+        """
+        Return the values of enabled units in batches.
+
+        Args:
+            size (int): the number of units in a batch
+
+        Raises:
+            TypeError: @size is not an integer
+            ValueError: @size is under 1
+
+        Yields:
+            numpy.ndarray: values of enabled units in a batch
+        """
+        if not isinstance(size, int):
+            raise TypeError(
+                f"@size must be integer, but {size} was applied.")
+        if size < 1:
+            raise ValueError(
+                f"@size must be over 0, but {size} was applied.")
+        idx = self.enabled_indices()
+        for start in range(0, len(idx), size):
+            yield self._values[idx[start: start + size]]
 
     def _validate_index(self, num):
         """
@@ -76,47 +361,117 @@ class Series(object):
         if not isinstance(num, int):
             raise TypeError(
                 f"@num must be integer, but {num} was applied.")
-        try:
-            self._units[num]
-        except IndexError:
-            raise IndexError(f"@num must be under {len(self._units)}")
+        if not -self._size <= num < self._size:
+            raise IndexError(f"@num must be under {self._size}")
+
+    def _positions(self, key):
+        """
+        Convert the key to index numbers of units.
+
+        Args:
+            key (int or slice or list[int] or numpy.ndarray or callable): index number, slice, index numbers,
+                boolean mask or function which receives the values (numpy.ndarray) and returns a boolean mask
+
+        Raises:
+            TypeError: @key is not a valid type
+            IndexError: @key includes invalid index numbers or the length of boolean mask is not the same
+
+        Returns:
+            numpy.ndarray: index numbers (int64)
+        """
+        if isinstance(key, int):
+            self._validate_index(key)
+            return np.array([key % self._size])
+        if isinstance(key, slice):
+            return np.arange(self._size)[key]
+        if callable(key):
+            key = np.asarray(key(self.values))
+        array = np.asarray(key)
+        if array.dtype == np.bool_:
+            if array.shape != (self._size,):
+                raise IndexError(
+                    f"Length of the boolean mask must be {self._size}, but {len(array)} was applied.")
+            return np.flatnonzero(array)
+        if array.size == 0:
+            return np.array([], dtype=np.int64)
+        if not np.issubdtype(array.dtype, np.integer):
+            raise TypeError(
+                f"@num must be integer, slice, index numbers, boolean mask or callable, but {key} was applied.")
+        array = array.ravel().astype(np.int64)
+        if array.min() < -self._size or array.max() >= self._size:
+            raise IndexError(f"@num must be under {self._size}")
+        return array % self._size
+
+    def _set_states(self, positions, state):
+        """
+        Change the states of units, updating the number and the sum of enabled values.
+
+        Args:
+            positions (numpy.ndarray): index numbers of the units
+            state (bool): True (enabled) or False (disabled)
+        """
+        positions = np.unique(positions)
+        changed = positions[self._enabled[positions] != state]
+        if not len(changed):
+            return
+        self._enabled[changed] = state
+        sign = 1 if state else -1
+        self._n_enabled += sign * len(changed)
+        self._enabled_sum += sign * self._values[changed].sum().item()
+        if self._stale:
+            return
+        self._n_pending += len(changed)
+        if self._n_pending > self._size // 8:
+            # Changes will not be kept (memory usage is limited) because re-computation is cheaper than merging
+            (self._pending, self._n_pending, self._stale) = ([], 0, True)
+        else:
+            self._pending.append(changed)
 
     def enable(self, num):
         """
-        Enable a unit.
+        Enable units.
 
         Args:
-            num (int): index of the unit to be enabled
+            num (int or slice or list[int] or numpy.ndarray or callable): index number of the unit to be enabled,
+                slice, index numbers, boolean mask or function which receives the values (numpy.ndarray)
+                and returns a boolean mask
 
         Raises:
-            TypeError: @num is not an integer
-            IndexError: @num is not a valid index number
+            TypeError: @num is not a valid type
+            IndexError: @num includes invalid index numbers
         """
-        self._validate_index(num)
-        self._units[num].enable()
+        self._set_states(self._positions(num), True)
 
     def disable(self, num):
         """
-        Disable a unit.
+        Disable units.
 
         Args:
-            num (int): index of the unit to be disabled
+            num (int or slice or list[int] or numpy.ndarray or callable): index number of the unit to be disabled,
+                slice, index numbers, boolean mask or function which receives the values (numpy.ndarray)
+                and returns a boolean mask
 
         Raises:
-            TypeError: @num is not an integer
-            IndexError: @num is not a valid index number
+            TypeError: @num is not a valid type
+            IndexError: @num includes invalid index numbers
         """
-        self._validate_index(num)
-        self._units[num].disable()
+        self._set_states(self._positions(num), False)
 
 
-def show_enabled(series):
+def show_enabled(series, chunksize=65536):
     """
     Show the values of enabled units.
+
+    Args:
+        series (Series): series of units
+        chunksize (int): the number of units processed at once
     """
     if not isinstance(series, Series):
         raise TypeError("@unit must be a instance of Series")
-    print([unit.value for unit in series if unit])
+    values = []
+    for chunk in series.iter_enabled_chunks(chunksize):
+        values.extend(chunk.tolist())
+    print(values)
 
 
 if __name__ == "__main__":
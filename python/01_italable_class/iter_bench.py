@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import tracemalloc
+from iter_advanced import Series, Unit
+
+
+class DictUnit(object):
+    """
+    Unit without __slots__ (the previous implementation) for comparison.
+    """
+
+    def __init__(self, value):
+        self._value = value
+        self._enabled = True
+
+    def __bool__(self):
+        return self._enabled
+
+
+def measure(func):
+    """
+    Measure memory allocated with the function.
+
+    Args:
+        func (callable): function to measure
+
+    Returns:
+        tuple(float, float): memory [MiB] held by the returned object and peak [MiB] during the call
+    """
+    tracemalloc.start()
+    result = func()
+    (current, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return (current / 1024 ** 2, peak / 1024 ** 2)
+
+
+def bench_memory(n=1000000):
+    """
+    Compare memory of units.
+
+    Args:
+        n (int): the number of units
+    """
+    def build_series():
+        series = Series()
+        series.extend(range(n))
+        return series
+
+    series = build_series()
+    cases = [
+        ("list of Unit without __slots__", lambda: [DictUnit(i) for i in range(n)]),
+        ("list of Unit with __slots__", lambda: [Unit(i) for i in range(n)]),
+        ("Series (arrays)", build_series),
+        ("iteration of Series with UnitView", lambda: sum(1 for unit in series if unit)),
+    ]
+    print("| case | units | held [MiB] | peak [MiB] |")
+    print("|:--|--:|--:|--:|")
+    for (name, func) in cases:
+        current, peak = measure(func)
+        print(f"| {name} | {n} | {current:.1f} | {peak:.1f} |")
+
+
+def main():
+    bench_memory()
+
+
+if __name__ == "__main__":
+    main()
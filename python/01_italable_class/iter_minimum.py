@@ -1,26 +1,75 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+from collections.abc import Sequence
+import itertools
+
+
 class IterClass(object):
     """
     Iterable class.
 
     Args:
-        values (list[object] or tuple(object)): list of values
+        values (iterable[object]): values, including list, tuple, generator and infinite iterator
 
     Raises:
-        TypeError: @values is not a list/tuple
+        TypeError: @values is not iterable
+
+    Notes:
+        Values will be read lazily. Iterators (e.g. generators) can be iterated only once.
     """
 
     def __init__(self, values):
-        if not isinstance(values, (list, tuple)):
-            raise TypeError("@values must be a list or tuple.")
+        try:
+            iter(values)
+        except TypeError:
+            raise TypeError(f"@values must be iterable, but {values} was applied.") from None
         self._values = values
 
     def __iter__(self):
         yield from self._values
 
+    def iter_chunks(self, size):
+        """
+        Return values in batches.
+
+        Args:
+            size (int): the number of values in a batch
+
+        Raises:
+            TypeError: @size is not an integer
+            ValueError: @size is under 1
+
+        Yields:
+            list[object] or slice of @values: values in a batch, slices for sequences/arrays and lists for iterators
+
+        Notes:
+            The last batch may be shorter than @size.
+            Strings and bytes will be returned as lists of the values of __iter__() (e.g. characters),
+            not as substrings.
+        """
+        if not isinstance(size, int):
+            raise TypeError(f"@size must be integer, but {size} was applied.")
+        if size < 1:
+            raise ValueError(f"@size must be over 0, but {size} was applied.")
+        is_text = isinstance(self._values, (str, bytes, bytearray))
+        if not is_text and (isinstance(self._values, Sequence) or hasattr(self._values, "__array__")):
+            for start in range(0, len(self._values), size):
+                yield self._values[start: start + size]
+            return
+        iterator = iter(self._values)
+        while True:
+            chunk = list(itertools.islice(iterator, size))
+            if not chunk:
+                return
+            yield chunk
+
 
 if __name__ == "__main__":
     iteration = IterClass(["a", "ab", "abc", "bb", "cc"])
     print([v for v in iteration if "a" in v])
+    # Batches
+    print([v for chunk in iteration.iter_chunks(2) for v in chunk if "a" in v])
+    # Infinite iterator
+    stream = IterClass("a" * i for i in itertools.count())
+    print(next(stream.iter_chunks(3)))
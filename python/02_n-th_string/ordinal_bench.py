@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from collections import defaultdict
+import time
+import numpy as np
+from ordinal_func import int2ordinal, ints2ordinals
+
+
+def int2ordinal_legacy(num):
+    """
+    Convert a natural number to a ordinal number (the previous implementation for comparison).
+    """
+    if not isinstance(num, int):
+        raise TypeError(
+            f"@num must be integer, but {num} was applied.")
+    if num < 0:
+        raise ValueError(
+            f"@num must be over 0, but {num} was applied.")
+    ordinal_dict = defaultdict(lambda: "th")
+    ordinal_dict.update({1: "st", 2: "nd", 3: "rd"})
+    q, mod = divmod(num, 10)
+    suffix = "th" if q % 10 == 1 else ordinal_dict[mod]
+    return f"{num}{suffix}"
+
+
+def bench(n=1000000, high=1000, seed=0):
+    """
+    Compare conversion of natural numbers to ordinal numbers.
+
+    Args:
+        n (int): the number of values
+        high (int): values will be selected from 0 to @high - 1
+        seed (int): random seed
+    """
+    array = np.random.default_rng(seed).integers(0, high, n)
+    nums = array.tolist()
+    cases = [
+        ("int2ordinal_legacy() for each value", lambda: [int2ordinal_legacy(num) for num in nums]),
+        ("int2ordinal() for each value (cached)", lambda: [int2ordinal(num) for num in nums]),
+        ("ints2ordinals() with list", lambda: ints2ordinals(nums)),
+        ("ints2ordinals() with numpy.ndarray", lambda: ints2ordinals(array).tolist()),
+    ]
+    expected = None
+    print("| method | values | time [sec] |")
+    print("|:--|--:|--:|")
+    for (name, func) in cases:
+        start = time.perf_counter()
+        result = func()
+        runtime = time.perf_counter() - start
+        expected = expected or result
+        if result != expected:
+            raise AssertionError(f"Results of {name} are different.")
+        print(f"| {name} | {n} | {runtime:.3f} |")
+
+
+if __name__ == "__main__":
+    # Small values, like phase numbers
+    bench(high=1000)
+    # Large values
+    bench(high=10 ** 9)
@@ -2,6 +2,47 @@
 # -*- coding: utf-8 -*-
 
 from collections import defaultdict
+from functools import lru_cache
+import re
+import numpy as np
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# Suffixes of ordinal numbers
+_ORDINAL_DICT = defaultdict(lambda: "th", {1: "st", 2: "nd", 3: "rd"})
+# Suffixes for the last two digits (0-99), like "th" for 11
+_SUFFIXES = tuple("th" if (num // 10) % 10 == 1 else _ORDINAL_DICT[num % 10] for num in range(100))
+_SUFFIX_ARRAY = np.array(_SUFFIXES)
+# Pattern of ordinal numbers, like 0th, 1st, 2nd (leading zeros are not allowed)
+_ORDINAL_PATTERN = re.compile(r"(0|[1-9][0-9]*)(st|nd|rd|th)")
+# Pre-computed ordinal numbers (0th-999th) and natural numbers
+_ORDINAL_TABLE = {f"{num}{_SUFFIXES[num % 100]}": num for num in range(1000)}
+
+
+def _ensure_natural(num, name="num"):
+    """
+    Ensure that the value is a natural number.
+
+    Args:
+        num (int): value to check
+        name (str): argument name of the value
+
+    Raises:
+        TypeError: @num is not an integer (bool is not allowed)
+        ValueError: @num is under 0
+
+    Returns:
+        int: the value
+    """
+    if not isinstance(num, int) or isinstance(num, bool):
+        raise TypeError(
+            f"@{name} must be integer, but {num} was applied.")
+    if num < 0:
+        raise ValueError(
+            f"@{name} must be over 0, but {num} was applied.")
+    return num
 
 
 def int2ordinal(num):
@@ -17,17 +58,150 @@ def int2ordinal(num):
     Notes:
         Zero can be used as @num argument.
     """
-    if not isinstance(num, int):
+    return _int2ordinal(_ensure_natural(num, name="num"))
+
+
+@lru_cache(maxsize=4096)
+def _int2ordinal(num):
+    """
+    Convert a natural number to a ordinal number without validation.
+
+    Args:
+        num (int): natural number
+
+    Returns:
+        str: ordinal number, like 0th, 1st, 2nd,...
+    """
+    return f"{num}{_SUFFIXES[num % 100]}"
+
+
+def ints2ordinals(nums):
+    """
+    Convert natural numbers to ordinal numbers at once.
+
+    Args:
+        nums (list[int] or numpy.ndarray or pandas.Series): natural numbers
+
+    Returns:
+        list[str] or numpy.ndarray or pandas.Series: ordinal numbers, like 0th, 1st, 2nd,..., with the same type as @nums
+
+    Notes:
+        Zero can be used as @nums argument.
+    """
+    array = np.asarray(nums)
+    if array.size == 0:
+        array = array.astype(np.int64)
+    if array.dtype == np.bool_ or not np.issubdtype(array.dtype, np.integer):
         raise TypeError(
-            f"@num must be integer, but {num} was applied.")
-    if num < 0:
+            f"@nums must be integers, but {nums} was applied.")
+    if array.size and array.min() < 0:
         raise ValueError(
-            f"@num must be over 0, but {num} was applied.")
-    ordinal_dict = defaultdict(lambda: "th")
-    ordinal_dict.update({1: "st", 2: "nd", 3: "rd"})
-    q, mod = divmod(num, 10)
-    suffix = "th" if q % 10 == 1 else ordinal_dict[mod]
-    return f"{num}{suffix}"
+            f"@nums must be over 0, but {array.min()} was included.")
+    if array.size and array.max() < array.size // 4:
+        # Convert each value only once when values are small, like phase numbers
+        table = np.arange(array.max() + 1)
+        ordinals = np.char.add(table.astype(str), _SUFFIX_ARRAY[table % 100])[array]
+    else:
+        ordinals = np.char.add(array.astype(str), _SUFFIX_ARRAY[array % 100])
+    if pd is not None and isinstance(nums, pd.Series):
+        return pd.Series(ordinals, index=nums.index, name=nums.name, dtype=object)
+    if isinstance(nums, np.ndarray):
+        return ordinals
+    return ordinals.tolist()
+
+
+def ordinal2int(ordinal, last=None):
+    """
+    Convert an ordinal number to a natural number.
+
+    Args:
+        ordinal (str): ordinal number, like 0th, 1st, 2nd,... or "last"
+        last (int or None): natural number of "last", or None ("last" is not allowed)
+
+    Raises:
+        TypeError: @ordinal is not a string or @last is not an integer
+        ValueError: @ordinal is not a valid ordinal number, like "1th", "01st" and "last" without @last,
+            or @last is under 0
+
+    Returns:
+        int: natural number
+    """
+    if ordinal in _ORDINAL_TABLE:
+        return _ORDINAL_TABLE[ordinal]
+    if not isinstance(ordinal, str):
+        raise TypeError(
+            f"@ordinal must be a string, but {ordinal} was applied.")
+    if ordinal == "last":
+        if last is None:
+            raise ValueError("@last must be applied to convert 'last'.")
+        return _ensure_natural(last, name="last")
+    return _ordinal2int(ordinal)
+
+
+@lru_cache(maxsize=4096)
+def _ordinal2int(ordinal):
+    """
+    Convert an ordinal number to a natural number with the pattern.
+
+    Args:
+        ordinal (str): ordinal number, like 0th, 1st, 2nd,...
+
+    Raises:
+        ValueError: @ordinal is not a valid ordinal number
+
+    Returns:
+        int: natural number
+    """
+    match = _ORDINAL_PATTERN.fullmatch(ordinal)
+    if match is None:
+        raise ValueError(
+            f"@ordinal must be an ordinal number, like 0th, 1st, 2nd, but {ordinal} was applied.")
+    num = int(match.group(1))
+    if match.group(2) != _SUFFIXES[num % 100]:
+        raise ValueError(
+            f"The suffix of {ordinal} must be {_SUFFIXES[num % 100]}.")
+    return num
+
+
+def ordinal_range(start, end, last=None):
+    """
+    Return ordinal numbers from @start to @end (inclusive).
+
+    Args:
+        start (str or int): the first ordinal number, like 0th, or natural number
+        end (str or int): the last ordinal number, like 7th or "last", or natural number
+        last (int or None): natural number of "last", or None ("last" is not allowed)
+
+    Raises:
+        TypeError: @start, @end or @last is neither a string nor an integer (bool is not allowed)
+        ValueError: natural numbers are under 0, or @end is smaller than @start
+
+    Returns:
+        list[str]: ordinal numbers, like ["0th", "1st", "2nd"]
+    """
+    if last is not None:
+        _ensure_natural(last, name="last")
+    start_num = ordinal2int(start, last=last) if isinstance(start, str) else _ensure_natural(start, name="start")
+    end_num = ordinal2int(end, last=last) if isinstance(end, str) else _ensure_natural(end, name="end")
+    if end_num < start_num:
+        raise ValueError(
+            f"@end must be the same as or larger than @start, but {start} and {end} were applied.")
+    return list(_ordinal_range(start_num, end_num))
+
+
+@lru_cache(maxsize=1024)
+def _ordinal_range(start_num, end_num):
+    """
+    Return ordinal numbers from @start_num to @end_num (inclusive) without validation.
+
+    Args:
+        start_num (int): the first natural number
+        end_num (int): the last natural number
+
+    Returns:
+        tuple(str): ordinal numbers
+    """
+    return tuple(_int2ordinal(num) for num in range(start_num, end_num + 1))
 
 
 if __name__ == "__main__":
@@ -40,3 +214,10 @@ if __name__ == "__main__":
     print(int2ordinal(21))
     print(int2ordinal(111))
     print(int2ordinal(121))
+    print(ints2ordinals([0, 1, 2, 3, 4, 11, 21, 111, 121]))
+    print(ordinal2int("0th"))
+    print(ordinal2int("111th"))
+    print(ordinal2int("1121st"))
+    print(ordinal2int("last", last=7))
+    print(ordinal_range("0th", "7th"))
+    print(ordinal_range("5th", "last", last=7))
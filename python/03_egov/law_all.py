@@ -1,11 +1,62 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import asyncio
 import codecs
+from contextlib import contextmanager
+import io
+import itertools
 import json
-import re
+import time
+from urllib.parse import urlparse
 from xml.etree import ElementTree
-import requests
+import aiohttp
+from law_cache import DiskCache, MemoryCache
+from law_corpus import Corpus
+from law_index import LawIndex
+from law_parse import iter_law_info, iter_law_list, iter_law_texts
+from law_preprocess import pre_process
+from law_transport import get_transport
+
+
+class LawFetchError(Exception):
+    """
+    Error raised when some laws could not be retrieved with LawLoader.get_raw_many().
+
+    Args:
+        errors (dict(str, Exception)): law numbers (keys) and the errors (values)
+    """
+
+    def __init__(self, errors):
+        self.errors = dict(errors)
+        super().__init__(f"{len(self.errors)} laws could not be retrieved: {', '.join(self.errors)}")
+
+
+class _HostRateLimiter(object):
+    """
+    Keep the interval between requests to the same host.
+
+    Args:
+        interval (float): minimum interval [sec] between the starts of requests to a host
+    """
+
+    def __init__(self, interval):
+        self._interval = interval
+        self._next_dict = {}
+
+    async def wait(self, url):
+        """
+        Wait until a request to the host of the URL is allowed.
+
+        Args:
+            url (str): URL to access
+        """
+        host = urlparse(url).netloc
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self._next_dict.get(host, now))
+        self._next_dict[host] = start + self._interval
+        await asyncio.sleep(start - now)
 
 
 class LawLoader(object):
@@ -14,16 +65,33 @@ class LawLoader(object):
 
     Args:
         category (int): category number, like 1 (all), 2 (法令), 3 (政令), 4 (省令)
+        api_url (str): base URL of e-Gov API, which can be replaced with that of a local server for testing
+        cache (DiskCache or None): persistent cache of the API responses, or None (disabled)
+        memory_bytes (int): the maximum total size [byte] of the raw contents cached in memory
+        stream (bool): whether parse XML data incrementally with a single pass or not
+        index_file (str or None): filename to save/load the n-gram index of law names, or None (not saved)
+        transport (Transport or None): HTTP transport, or None (the shared transport)
     """
+    API_URL = "https://elaws.e-gov.go.jp/api/1"
+    # Status codes which will be retried with get_raw_many()
+    RETRY_STATUS = (429, 500, 502, 503, 504)
 
-    def __init__(self, category=1):
-        self.law_dict = self._get_law_dict(category=category)
-        self.content_dict = {}
+    def __init__(self, category=1, api_url=API_URL, cache=None, memory_bytes=64 * 1024 ** 2, stream=False,
+                 index_file=None, transport=None):
+        self.api_url = api_url.rstrip("/")
+        self.transport = transport or get_transport()
+        self.cache = cache
+        self.stream = stream
+        self.law_dict = self._load_law_dict(category=category)
+        if index_file is None:
+            self.law_index = LawIndex(self.law_dict)
+        else:
+            self.law_index = LawIndex.load(index_file, self.law_dict)
+        self.content_cache = MemoryCache(max_bytes=memory_bytes)
 
-    @staticmethod
-    def _get_xml(url):
+    def _get_xml(self, url):
         """
-        Get XML data from e-Gov API.
+        Get XML data from e-Gov API or the cache.
 
         Args:
             url (str): key of the API
@@ -31,8 +99,52 @@ class LawLoader(object):
         Returns:
             xml.ElementTree: element tree of the XML data
         """
-        r = requests.get(url)
-        return ElementTree.fromstring(r.content.decode(encoding="utf-8"))
+        if self.cache is None:
+            content = self.transport.get(url).content
+        else:
+            content = self.cache.get(url)
+        return ElementTree.fromstring(content.decode(encoding="utf-8"))
+
+    @contextmanager
+    def _open_xml(self, url):
+        """
+        Open XML data from e-Gov API or the cache as a byte stream with "with" statement.
+
+        Args:
+            url (str): key of the API
+
+        Yields:
+            file object: byte stream of the XML data
+
+        Notes:
+            The streaming response will be closed at the end of the block
+            and the connection will be released to the pool of the transport.
+        """
+        if self.cache is not None:
+            yield io.BytesIO(self.cache.get(url))
+            return
+        r = self.transport.get(url, stream=True)
+        try:
+            r.raw.decode_content = True
+            yield r.raw
+        finally:
+            r.close()
+
+    def _load_law_dict(self, category):
+        """
+        Return dictionary of law names and numbers which will be registered to the loader.
+
+        Args:
+            category (int): category number, like 1 (all), 2 (法令), 3 (政令), 4 (省令)
+
+        Returns:
+            dict(str, str): dictionary of law names (keys) and numbers (values)
+
+        Notes:
+            This is called by LawLoader.__init__() after the transport and the cache were set,
+            and subclasses can override this to register laws of some categories.
+        """
+        return self._get_law_dict(category=category)
 
     def _get_law_dict(self, category):
         """
@@ -44,12 +156,58 @@ class LawLoader(object):
         Returns:
             dict(str, str): dictionary of law names (keys) and numbers (values)
         """
-        url = f"https://elaws.e-gov.go.jp/api/1/lawlists/{category}"
+        url = f"{self.api_url}/lawlists/{category}"
+        if self.stream:
+            with self._open_xml(url) as fh:
+                return dict(iter_law_list(fh))
         root = self._get_xml(url)
         names = [e.text for e in root.iter() if e.tag == "LawName"]
         numbers = [e.text for e in root.iter() if e.tag == "LawNo"]
         return {name: num for (name, num) in zip(names, numbers)}
 
+    def get_law_list(self, category=1):
+        """
+        Return the list of laws with their information.
+
+        Args:
+            category (int): category number, like 1 (all), 2 (法令), 3 (政令), 4 (省令)
+
+        Returns:
+            list[dict(str, str)]: information of the laws, like LawId, LawName, LawNo and PromulgationDate
+        """
+        url = f"{self.api_url}/lawlists/{category}"
+        with self._open_xml(url) as fh:
+            return list(iter_law_info(fh))
+
+    def invalidate(self, numbers=None, category=None):
+        """
+        Remove the cached responses so that they will be retrieved from e-Gov API again.
+
+        Args:
+            numbers (list[str] or None): numbers of the laws whose contents will be removed
+            category (int or None): category number whose lawlists will be removed
+        """
+        for number in numbers or []:
+            self.content_cache.pop(number)
+            if self.cache is not None:
+                self.cache.delete(f"{self.api_url}/lawdata/{number}")
+        if category is not None and self.cache is not None:
+            self.cache.delete(f"{self.api_url}/lawlists/{category}")
+
+    def revalidate(self, numbers):
+        """
+        Remove the contents from memory so that they will be revalidated with the persistent cache.
+
+        Args:
+            numbers (list[str]): numbers of the laws
+
+        Notes:
+            Unlike invalidate(), the persistent cache will be kept. The laws will be retrieved with conditional
+            requests (ETag/Last-Modified) after TTL of the cache, or retrieved again when the cache is disabled.
+        """
+        for number in numbers:
+            self.content_cache.pop(number)
+
     def get_law_number(self, keyword, category=1):
         """
         Return the law number.
@@ -62,7 +220,7 @@ class LawLoader(object):
         Returns:
             dict(str, str): dictionary of law name (key) and law number (value)
         """
-        return {k: v for (k, v) in self.law_dict.items() if keyword in k}
+        return self.law_index.search(keyword)
 
     def get_raw(self, number):
         """
@@ -74,34 +232,200 @@ class LawLoader(object):
         Returns:
             raw (list[str]): raw contents of J-GCP
         """
-        if number in self.content_dict:
-            return self.content_dict[number]
-        url = f"https://elaws.e-gov.go.jp/api/1/lawdata/{number}"
-        root = self._get_xml(url)
-        contents = [e.text.strip() for e in root.iter() if e.text]
-        raw = [t for t in contents if t]
-        self.content_dict = {number: raw}
+        raw = self.content_cache.get(number)
+        if raw is not None:
+            return raw
+        url = f"{self.api_url}/lawdata/{number}"
+        if self.stream:
+            with self._open_xml(url) as fh:
+                raw = list(iter_law_texts(fh))
+        else:
+            raw = self._parse_raw(self._get_xml(url))
+        self.content_cache.put(number, raw)
         return raw
 
+    def cache_info(self):
+        """
+        Return the statistics of the in-memory cache of raw contents.
+
+        Returns:
+            dict[str, int]: hits, misses, evictions, entries, bytes and max_bytes
+        """
+        return self.content_cache.info()
+
+    @staticmethod
+    def _parse_raw(root):
+        """
+        Return the raw contents of a law.
+
+        Args:
+            root (xml.ElementTree): element tree of lawdata
+
+        Returns:
+            raw (list[str]): raw contents of the law
+        """
+        contents = [e.text.strip() for e in root.iter() if e.text]
+        return [t for t in contents if t]
+
+    def get_raw_many(self, numbers, concurrency=10, interval=0.1, retries=3, backoff=1.0):
+        """
+        Retrieve contents of the laws concurrently from e-Gov API.
+
+        Args:
+            numbers (list[str]): numbers of the laws, like ['平成九年厚生省令第二十八号']
+            concurrency (int): the maximum number of requests at the same time
+            interval (float): minimum interval [sec] between the starts of requests to the same host
+            retries (int): the maximum number of retries for each law
+            backoff (float): waiting time [sec] before the first retry, which will be doubled with each retry
+
+        Raises:
+            TypeError: @concurrency or @retries is not an integer
+            ValueError: @concurrency is under 1 or @retries is under 0
+            LawFetchError: some laws could not be retrieved, raised after the other laws were yielded
+
+        Yields:
+            tuple(str, list[str]): law number and its raw contents, in the order of completion
+
+        Notes:
+            Laws in the cache will be returned at first without requests.
+            Failure of a law (e.g. 404 or retries were exhausted) does not stop retrieving the other laws.
+        """
+        for (name, value, min_value) in [("concurrency", concurrency, 1), ("retries", retries, 0)]:
+            if not isinstance(value, int):
+                raise TypeError(f"@{name} must be integer, but {value} was applied.")
+            if value < min_value:
+                raise ValueError(f"@{name} must be over {min_value - 1}, but {value} was applied.")
+        unique_numbers = list(dict.fromkeys(numbers))
+        for number in unique_numbers:
+            if number in self.content_cache:
+                yield (number, self.content_cache.get(number))
+        targets = [number for number in unique_numbers if number not in self.content_cache]
+        if not targets:
+            return
+        loop = asyncio.new_event_loop()
+        agen = self._fetch_many(targets, concurrency, interval, retries, backoff)
+        errors = {}
+        try:
+            while True:
+                try:
+                    (number, raw, error) = loop.run_until_complete(agen.__anext__())
+                except StopAsyncIteration:
+                    break
+                if error is not None:
+                    errors[number] = error
+                    continue
+                self.content_cache.put(number, raw)
+                yield (number, raw)
+        finally:
+            loop.run_until_complete(agen.aclose())
+            loop.close()
+        if errors:
+            raise LawFetchError(errors)
+
+    async def _fetch_many(self, numbers, concurrency, interval, retries, backoff):
+        """
+        Retrieve contents of the laws concurrently from e-Gov API.
+
+        Args:
+            numbers (list[str]): numbers of the laws
+            concurrency (int): the maximum number of requests at the same time
+            interval (float): minimum interval [sec] between the starts of requests to the same host
+            retries (int): the maximum number of retries for each law
+            backoff (float): waiting time [sec] before the first retry
+
+        Yields:
+            tuple(str, list[str] or None, Exception or None): law number, its raw contents and the error,
+                in the order of completion
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        limiter = _HostRateLimiter(interval)
+
+        async def fetch(session, number):
+            try:
+                return (*await self._fetch_raw(session, semaphore, limiter, number, retries, backoff), None)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ElementTree.ParseError) as e:
+                return (number, None, e)
+
+        async with self.transport.async_session(limit=concurrency) as session:
+            tasks = [asyncio.ensure_future(fetch(session, number)) for number in numbers]
+            try:
+                for future in asyncio.as_completed(tasks):
+                    yield await future
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch_raw(self, session, semaphore, limiter, number, retries, backoff):
+        """
+        Retrieve contents of the law with retries.
+
+        Args:
+            session (aiohttp.ClientSession): HTTP session
+            semaphore (asyncio.Semaphore): semaphore to limit the number of requests
+            limiter (_HostRateLimiter): rate limiter of each host
+            number (str): Number of the law, like '平成九年厚生省令第二十八号'
+            retries (int): the maximum number of retries
+            backoff (float): waiting time [sec] before the first retry
+
+        Raises:
+            aiohttp.ClientError: the law could not be retrieved with the retries
+
+        Returns:
+            tuple(str, list[str]): law number and its raw contents
+        """
+        url = f"{self.api_url}/lawdata/{number}"
+        content = None if self.cache is None else self.cache.lookup(url)
+        # Expired response will be revalidated with a conditional request
+        (cached, req_headers) = (None, {}) if content or self.cache is None else self.cache.conditional(url)
+        for i in range(0 if content else retries + 1):
+            try:
+                async with semaphore:
+                    await limiter.wait(url)
+                    start = time.perf_counter()
+                    async with session.get(url, headers=req_headers) as r:
+                        if r.status == 304 and cached is not None:
+                            self.transport.record(url, r.status, time.perf_counter() - start)
+                            self.cache.refresh(url)
+                            content = cached
+                            break
+                        if r.status not in self.RETRY_STATUS:
+                            r.raise_for_status()
+                            content = await r.read()
+                            self.transport.record(url, r.status, time.perf_counter() - start, len(content))
+                            if self.cache is not None:
+                                self.cache.store(url, content, headers=r.headers)
+                            break
+                        self.transport.record(url, r.status, time.perf_counter() - start)
+                        error = aiohttp.ClientResponseError(
+                            r.request_info, r.history, status=r.status, message=r.reason)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                self.transport.record(url, None, time.perf_counter() - start)
+                error = e
+            if i == retries:
+                raise error
+            await asyncio.sleep(backoff * 2 ** i)
+        if self.stream:
+            return (number, list(iter_law_texts(io.BytesIO(content))))
+        root = ElementTree.fromstring(content.decode(encoding="utf-8"))
+        return (number, self._parse_raw(root))
+
     @staticmethod
     def pre_process(raw):
         """
         Perform pre-processing on raw contents.
 
         Args:
-            raw (list[str]): raw contents
+            raw (iterable[str]): raw contents
 
         Returns:
             str: pre-processed string
 
         Notes:
-            - Strings enclosed with （ and ） will be removed.
+            - Strings enclosed with （ and ） will be removed, including nested parentheses.
             - 「 and 」 will be removed.
         """
-        contents = [s for s in raw if s.endswith("。")]
-        string = "".join(contents)
-        string = string.translate(str.maketrans({"「": "", "」": ""}))
-        return re.sub("（[^（|^）]*）", "", string)
+        return pre_process(raw)
 
     def gcp(self):
         """
@@ -121,19 +445,20 @@ class LawLoader(object):
         number_dict = self.get_law_number("医薬品の臨床試験")
         number = number_dict["医薬品の臨床試験の実施の基準に関する省令"]
         raw = self.get_raw(number)
-        raw_without56 = raw[: raw.index("第五十六条")]
+        raw_without56 = itertools.islice(raw, raw.index("第五十六条"))
         return self.pre_process(raw_without56)
 
 
 def main():
     # The Constitution of Japan
-    loader2 = LawLoader(category=2)
+    cache = DiskCache()
+    loader2 = LawLoader(category=2, cache=cache)
     consti_number = loader2.get_law_number("日本国憲法")
     print(consti_number)
     consti_raw = loader2.get_raw("昭和二十一年憲法")
     consti = loader2.pre_process(consti_raw)
     # J-GCP
-    loader4 = LawLoader(category=4)
+    loader4 = LawLoader(category=4, cache=cache)
     gcp = loader4.gcp()
     # Results
     result_dict = {
@@ -142,6 +467,7 @@ def main():
     }
     with codecs.open("law.json", "w", encoding="utf-8") as fh:
         json.dump(result_dict, fh, indent=4, ensure_ascii=False)
+    Corpus.save("law.corpus", result_dict)
 
 
 if __name__ == "__main__":
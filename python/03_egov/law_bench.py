@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import multiprocessing as mp
+import os
+import random
+import resource
+import tempfile
+import time
+from xml.etree import ElementTree
+from law_all import LawLoader
+from law_index import LawIndex
+from law_parse import iter_law_list, iter_law_texts
+
+
+def _make_law_list(filename, n):
+    """
+    Create a dummy XML file of lawlists.
+
+    Args:
+        filename (str): filename to save
+        n (int): the number of laws
+    """
+    with open(filename, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?><DataRoot><ApplData>')
+        for i in range(n):
+            fh.write(
+                f"<LawNameListInfo><LawId>{i}</LawId><LawName>医薬品の臨床試験の実施の基準に関する省令{i}</LawName>"
+                f"<LawNo>平成九年厚生省令第{i}号</LawNo><PromulgationDate>19970327</PromulgationDate></LawNameListInfo>")
+        fh.write("</ApplData></DataRoot>")
+
+
+def _make_law_data(filename, n):
+    """
+    Create a dummy XML file of lawdata.
+
+    Args:
+        filename (str): filename to save
+        n (int): the number of articles
+    """
+    with open(filename, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?><DataRoot><ApplData><Law><LawBody><MainProvision>')
+        for i in range(n):
+            fh.write(
+                f"<Article><ArticleCaption>（趣旨）</ArticleCaption><ArticleTitle>第{i}条</ArticleTitle>"
+                "<Paragraph><ParagraphSentence><Sentence>この省令は、被験者の人権の保護、安全の保持及び福祉の向上を図り、"
+                "治験の科学的な質及び成績の信頼性を確保するため、医薬品（以下「法」という。）の基準を定めるものとする。"
+                "</Sentence></ParagraphSentence></Paragraph></Article>")
+        fh.write("</MainProvision></LawBody></Law></ApplData></DataRoot>")
+
+
+def current_law_list(filename):
+    """
+    Parse lawlists with ElementTree.fromstring() and two passes (the current path).
+    """
+    with open(filename, "rb") as fh:
+        root = ElementTree.fromstring(fh.read().decode(encoding="utf-8"))
+    names = [e.text for e in root.iter() if e.tag == "LawName"]
+    numbers = [e.text for e in root.iter() if e.tag == "LawNo"]
+    return {name: num for (name, num) in zip(names, numbers)}
+
+
+def stream_law_list(filename):
+    """
+    Parse lawlists with iterparse and a single pass.
+    """
+    with open(filename, "rb") as fh:
+        return dict(iter_law_list(fh))
+
+
+def current_law_data(filename):
+    """
+    Parse lawdata with ElementTree.fromstring() (the current path).
+    """
+    with open(filename, "rb") as fh:
+        root = ElementTree.fromstring(fh.read().decode(encoding="utf-8"))
+    return LawLoader._parse_raw(root)
+
+
+def stream_law_data(filename):
+    """
+    Parse lawdata with iterparse and a single pass.
+    """
+    with open(filename, "rb") as fh:
+        return list(iter_law_texts(fh))
+
+
+def peak_rss():
+    """
+    Return peak RSS of the current process.
+
+    Returns:
+        float: peak RSS [MiB]
+
+    Notes:
+        VmHWM in /proc/self/status will be used if available because ru_maxrss includes the memory before exec.
+        ru_maxrss is in KiB on Linux.
+    """
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(func, filename, queue):
+    """
+    Measure runtime and increase of peak RSS with the function in a child process.
+
+    Args:
+        func (callable): function which parses the file
+        filename (str): filename of XML data
+        queue (multiprocessing.Queue): queue to return runtime [sec] and peak RSS increase [MiB]
+    """
+    base = peak_rss()
+    start = time.perf_counter()
+    func(filename)
+    runtime = time.perf_counter() - start
+    queue.put((runtime, peak_rss() - base))
+
+
+def measure(func, filename):
+    """
+    Measure runtime and increase of peak RSS with the function in a new process.
+
+    Args:
+        func (callable): function which parses the file
+        filename (str): filename of XML data
+
+    Returns:
+        tuple(float, float): runtime [sec] and peak RSS increase [MiB]
+    """
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_measure, args=(func, filename, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def bench_parse(n_laws=200000, n_articles=50000):
+    """
+    Compare XML parsing with ElementTree.fromstring() and iterparse.
+
+    Args:
+        n_laws (int): the number of laws in the dummy lawlists
+        n_articles (int): the number of articles in the dummy lawdata
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        list_file = os.path.join(tmp_dir, "lawlists.xml")
+        data_file = os.path.join(tmp_dir, "lawdata.xml")
+        _make_law_list(list_file, n_laws)
+        _make_law_data(data_file, n_articles)
+        if current_law_list(list_file) != stream_law_list(list_file):
+            raise AssertionError("Results of lawlists are different.")
+        if current_law_data(data_file) != stream_law_data(data_file):
+            raise AssertionError("Results of lawdata are different.")
+        print("| data | size [MiB] | parser | time [sec] | peak RSS increase [MiB] |")
+        print("|:--|--:|:--|--:|--:|")
+        for (name, filename, funcs) in [
+                ("lawlists", list_file, [current_law_list, stream_law_list]),
+                ("lawdata", data_file, [current_law_data, stream_law_data])]:
+            size = os.path.getsize(filename) / 1024 ** 2
+            for func in funcs:
+                runtime, rss = measure(func, filename)
+                print(f"| {name} | {size:.1f} | {func.__name__} | {runtime:.3f} | {rss:.1f} |")
+
+
+def _make_law_dict(n, seed=0):
+    """
+    Create a dummy dictionary of law names and numbers.
+
+    Args:
+        n (int): the number of laws
+        seed (int): random seed
+
+    Returns:
+        dict(str, str): dictionary of law names (keys) and numbers (values)
+    """
+    words = [
+        "医薬品", "医療機器", "臨床試験", "実施", "基準", "著作権", "特許", "商標", "地方税", "所得税", "農林水産",
+        "厚生労働", "国土交通", "施行", "規則", "特別措置", "臨時特例", "関する", "の", "等", "及び",
+    ]
+    rand = random.Random(seed)
+    return {
+        f"{''.join(rand.choices(words, k=rand.randint(3, 10)))}{kind}{i}": f"令和二年{kind}第{i}号"
+        for i in range(n) for kind in [rand.choice(["法", "政令", "省令"])]
+    }
+
+
+def bench_lookup(n_laws=10000, n_keywords=1000, seed=0):
+    """
+    Compare keyword search of law names with linear scan and n-gram index.
+
+    Args:
+        n_laws (int): the number of laws
+        n_keywords (int): the number of keywords
+        seed (int): random seed
+    """
+    law_dict = _make_law_dict(n_laws, seed=seed)
+    rand = random.Random(seed)
+    names = list(law_dict.keys())
+    keywords = []
+    for _ in range(n_keywords):
+        name = rand.choice(names)
+        start = rand.randrange(len(name))
+        keywords.append(name[start: start + rand.randint(1, 8)])
+    start = time.perf_counter()
+    index = LawIndex(law_dict)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    scan_results = [{k: v for (k, v) in law_dict.items() if keyword in k} for keyword in keywords]
+    scan_time = time.perf_counter() - start
+    start = time.perf_counter()
+    index_results = [index.search(keyword) for keyword in keywords]
+    index_time = time.perf_counter() - start
+    if scan_results != index_results:
+        raise AssertionError("Results of keyword search are different.")
+    print("| laws | keywords | build index [sec] | scan [msec/keyword] | index [msec/keyword] |")
+    print("|--:|--:|--:|--:|--:|")
+    print(
+        f"| {n_laws} | {n_keywords} | {build_time:.3f} | {scan_time / n_keywords * 1000:.3f} "
+        f"| {index_time / n_keywords * 1000:.3f} |")
+
+
+def main():
+    bench_parse()
+    bench_lookup()
+
+
+if __name__ == "__main__":
+    main()
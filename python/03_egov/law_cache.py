@@ -0,0 +1,315 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+import hashlib
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from law_transport import get_transport
+
+
+class MemoryCache(object):
+    """
+    In-memory LRU cache whose size is limited with the total bytes of the values.
+
+    Args:
+        max_bytes (int): the maximum total size [byte] of the values
+
+    Notes:
+        Values larger than @max_bytes will not be cached.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 ** 2):
+        if not isinstance(max_bytes, int):
+            raise TypeError(f"@max_bytes must be integer, but {max_bytes} was applied.")
+        self._max_bytes = max_bytes
+        self._dict = OrderedDict()
+        self._size_dict = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        return key in self._dict
+
+    def __len__(self):
+        return len(self._dict)
+
+    @staticmethod
+    def _sizeof(value):
+        """
+        Return the size of the value, including the elements of list/tuple.
+
+        Args:
+            value (object): value to be cached
+
+        Returns:
+            int: size [byte]
+        """
+        size = sys.getsizeof(value)
+        if isinstance(value, (list, tuple)):
+            size += sum(sys.getsizeof(v) for v in value)
+        return size
+
+    def get(self, key, default=None):
+        """
+        Return the cached value and count hit/miss.
+
+        Args:
+            key (str): key of the value
+            default (object): value to return when not cached
+
+        Returns:
+            object: the cached value or @default
+        """
+        if key not in self._dict:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._dict.move_to_end(key)
+        return self._dict[key]
+
+    def put(self, key, value):
+        """
+        Save the value, removing the least recently used values if necessary.
+
+        Args:
+            key (str): key of the value
+            value (object): value to be cached
+        """
+        size = self._sizeof(value)
+        if size > self._max_bytes:
+            return
+        if key in self._dict:
+            self._bytes -= self._size_dict.pop(key)
+            del self._dict[key]
+        while self._bytes + size > self._max_bytes:
+            (old_key, _) = self._dict.popitem(last=False)
+            self._bytes -= self._size_dict.pop(old_key)
+            self.evictions += 1
+        self._dict[key] = value
+        self._size_dict[key] = size
+        self._bytes += size
+
+    def pop(self, key):
+        """
+        Remove the value from the cache.
+
+        Args:
+            key (str): key of the value
+        """
+        if key in self._dict:
+            del self._dict[key]
+            self._bytes -= self._size_dict.pop(key)
+
+    def info(self):
+        """
+        Return the statistics of the cache.
+
+        Returns:
+            dict[str, int]: hits, misses, evictions, entries, bytes and max_bytes
+        """
+        return {
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            "entries": len(self._dict), "bytes": self._bytes, "max_bytes": self._max_bytes,
+        }
+
+
+class DiskCache(object):
+    """
+    Persistent cache of API responses with SQLite.
+    Responses are compressed and saved with their SHA-256 digests, and URLs are linked to the digests.
+
+    Args:
+        path (str): filename of the SQLite database
+        ttl (float): time to live [sec] of the responses, revalidation will be done after that
+        max_bytes (int): the maximum size [byte] of the compressed responses
+        transport (Transport or None): HTTP transport, or None (the shared transport)
+
+    Notes:
+        When the total size exceeds @max_bytes, the least recently used responses will be removed.
+        The cache can be shared by threads.
+    """
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, body BLOB, size INTEGER)",
+        "CREATE TABLE IF NOT EXISTS urls ("
+        "url TEXT PRIMARY KEY, digest TEXT, etag TEXT, last_modified TEXT, fetched REAL, accessed REAL)",
+        "CREATE INDEX IF NOT EXISTS urls_accessed ON urls (accessed)",
+    ]
+
+    def __init__(self, path="egov_cache.sqlite3", ttl=86400, max_bytes=512 * 1024 ** 2, transport=None):
+        self._path = path
+        self._transport = transport or get_transport()
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._conn = None
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self):
+        """
+        sqlite3.Connection: connection to the database, which will be opened at the first access
+        """
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self._path, check_same_thread=False)
+                with self._conn:
+                    for sql in self.SCHEMA:
+                        self._conn.execute(sql)
+            return self._conn
+
+    def close(self):
+        """
+        Close the connection to the database.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _select(self, url):
+        """
+        Return the cached response of the URL.
+
+        Args:
+            url (str): URL of the API
+
+        Returns:
+            tuple(bytes, str, str, float) or None: response body, ETag, Last-Modified and the time of fetching
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT b.body, u.etag, u.last_modified, u.fetched FROM urls AS u "
+                "JOIN blobs AS b ON u.digest = b.digest WHERE u.url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE urls SET accessed = ? WHERE url = ?", (time.time(), url))
+        return (zlib.decompress(row[0]), *row[1:])
+
+    def lookup(self, url):
+        """
+        Return the cached response of the URL if it is within TTL.
+
+        Args:
+            url (str): URL of the API
+
+        Returns:
+            bytes or None: response body or None (not cached or expired)
+        """
+        cached = self._select(url)
+        if cached is None or time.time() - cached[3] >= self._ttl:
+            return None
+        return cached[0]
+
+    def conditional(self, url):
+        """
+        Return the cached response of the URL and request headers to revalidate it with a conditional request.
+
+        Args:
+            url (str): URL of the API
+
+        Returns:
+            tuple(bytes or None, dict(str, str)): response body (None when not cached) and request headers
+                with If-None-Match/If-Modified-Since (empty when ETag/Last-Modified is not available)
+        """
+        cached = self._select(url)
+        if cached is None:
+            return (None, {})
+        req_headers = {}
+        if cached[1]:
+            req_headers["If-None-Match"] = cached[1]
+        if cached[2]:
+            req_headers["If-Modified-Since"] = cached[2]
+        return (cached[0], req_headers)
+
+    def refresh(self, url):
+        """
+        Update the time of fetching of the response, which was not modified (304) with a conditional request.
+
+        Args:
+            url (str): URL of the API
+        """
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE urls SET fetched = ? WHERE url = ?", (time.time(), url))
+
+    def store(self, url, body, headers=None):
+        """
+        Save the response of the URL.
+
+        Args:
+            url (str): URL of the API
+            body (bytes): response body
+            headers (collections.abc.Mapping or None): response headers to get ETag and Last-Modified
+
+        Notes:
+            Header names are case-insensitive (e.g. "Etag" and "etag" with HTTP/2).
+        """
+        headers = {k.lower(): v for (k, v) in (headers or {}).items()}
+        digest = hashlib.sha256(body).hexdigest()
+        now = time.time()
+        compressed = zlib.compress(body)
+        with self._lock, self.conn:
+            if self.conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone() is None:
+                self.conn.execute(
+                    "INSERT INTO blobs VALUES (?, ?, ?)", (digest, compressed, len(compressed)))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO urls VALUES (?, ?, ?, ?, ?, ?)",
+                (url, digest, headers.get("etag"), headers.get("last-modified"), now, now))
+            self._evict()
+
+    def delete(self, url):
+        """
+        Remove the response of the URL from the cache.
+
+        Args:
+            url (str): URL of the API
+        """
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM urls WHERE url = ?", (url,))
+            self.conn.execute("DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM urls)")
+
+    def _evict(self):
+        """
+        Remove the least recently used responses until the total size is under the limit.
+        """
+        self.conn.execute("DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM urls)")
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        rows = self.conn.execute(
+            "SELECT u.url, b.size FROM urls AS u JOIN blobs AS b ON u.digest = b.digest "
+            "ORDER BY u.accessed").fetchall()
+        for (url, size) in rows[:-1]:
+            self.conn.execute("DELETE FROM urls WHERE url = ?", (url,))
+            total -= size
+            if total <= self._max_bytes:
+                break
+        self.conn.execute("DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM urls)")
+
+    def get(self, url):
+        """
+        Return the response of the URL with the cache.
+        Expired responses will be revalidated with ETag/Last-Modified if available.
+
+        Args:
+            url (str): URL of the API
+
+        Returns:
+            bytes: response body
+        """
+        content = self.lookup(url)
+        if content is not None:
+            return content
+        (cached, req_headers) = self.conditional(url)
+        r = self._transport.get(url, headers=req_headers)
+        if r.status_code == 304 and cached is not None:
+            self.refresh(url)
+            return cached
+        if r.ok:
+            self.store(url, r.content, headers=r.headers)
+        return r.content
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ThreadPoolExecutor
+from law_all import LawLoader
+from law_cache import DiskCache
+
+
+class LawCatalog(LawLoader):
+    """
+    Catalog of laws in some categories, which will be retrieved concurrently and merged without duplicates.
+
+    Args:
+        categories (list[int]): category numbers, like 2 (法令), 3 (政令), 4 (省令)
+        api_url (str): base URL of e-Gov API, which can be replaced with that of a local server for testing
+        cache (DiskCache or None): persistent cache of the API responses, or None (disabled)
+        memory_bytes (int): the maximum total size [byte] of the raw contents cached in memory
+        stream (bool): whether parse XML data incrementally with a single pass or not
+        index_file (str or None): filename to save/load the n-gram index of law names, or None (not saved)
+        transport (Transport or None): HTTP transport, or None (the shared transport)
+
+    Notes:
+        Methods of LawLoader, including get_raw() and get_raw_many(), can be used.
+        Law names and numbers are shared by the merged index and the views of categories.
+    """
+
+    def __init__(self, categories=(2, 3, 4), api_url=LawLoader.API_URL, cache=None, memory_bytes=64 * 1024 ** 2,
+                 stream=False, index_file=None, transport=None):
+        if not isinstance(categories, (list, tuple)) or not all(isinstance(v, int) for v in categories):
+            raise TypeError(f"@categories must be a list of integers, but {categories} was applied.")
+        if not categories:
+            raise ValueError("@categories must include at least one category number, but an empty list was applied.")
+        self.categories = list(dict.fromkeys(categories))
+        # Bit flags of categories, 1 << category
+        self._flag_dict = {}
+        super().__init__(
+            category=self.categories, api_url=api_url, cache=cache, memory_bytes=memory_bytes, stream=stream,
+            index_file=index_file, transport=transport)
+
+    def _load_law_dict(self, category):
+        """
+        Return dictionary of law names and numbers in the categories, retrieving them concurrently.
+
+        Args:
+            category (list[int]): category numbers
+
+        Returns:
+            dict(str, str): dictionary of law names (keys) and numbers (values) without duplicates
+        """
+        with ThreadPoolExecutor(max_workers=len(category)) as executor:
+            dicts = list(executor.map(lambda num: self._get_law_dict(category=num), category))
+        law_dict = {}
+        for (num, category_dict) in zip(category, dicts):
+            for (name, number) in category_dict.items():
+                if name not in law_dict:
+                    law_dict[name] = number
+                    self._flag_dict[name] = 0
+                self._flag_dict[name] |= 1 << num
+        return law_dict
+
+    def _category_flag(self, category):
+        """
+        Return the bit flag of the category.
+
+        Args:
+            category (int): category number, like 2 (法令), 3 (政令), 4 (省令)
+
+        Raises:
+            KeyError: the category is not included in the catalog
+
+        Returns:
+            int: 1 << category
+        """
+        if category not in self.categories:
+            raise KeyError(f"@category must be one of {self.categories}, but {category} was applied.")
+        return 1 << category
+
+    def categories_of(self, name):
+        """
+        Return the categories of the law.
+
+        Args:
+            name (str): law name
+
+        Raises:
+            KeyError: the law is not included in the catalog
+
+        Returns:
+            list[int]: category numbers
+        """
+        flag = self._flag_dict[name]
+        return [category for category in self.categories if flag & (1 << category)]
+
+    def view(self, category):
+        """
+        Return dictionary of law names and numbers in the category.
+
+        Args:
+            category (int): category number, like 2 (法令), 3 (政令), 4 (省令)
+
+        Raises:
+            KeyError: the category is not included in the catalog
+
+        Returns:
+            dict(str, str): dictionary of law names (keys) and numbers (values)
+        """
+        flag = self._category_flag(category)
+        return {name: self.law_dict[name] for (name, v) in self._flag_dict.items() if v & flag}
+
+    def get_law_number(self, keyword, category=None):
+        """
+        Return the law number.
+
+        Args:
+            keyword (str): keyword of the law name
+            category (int or None): category number to select, or None (all categories)
+
+        Raises:
+            KeyError: the category is not included in the catalog
+
+        Returns:
+            dict(str, str): dictionary of law name (key) and law number (value)
+        """
+        flag = None if category is None else self._category_flag(category)
+        found_dict = self.law_index.search(keyword)
+        if flag is None:
+            return found_dict
+        return {name: number for (name, number) in found_dict.items() if self._flag_dict[name] & flag}
+
+
+def main():
+    catalog = LawCatalog(categories=[2, 3, 4], cache=DiskCache())
+    print({category: len(catalog.view(category)) for category in catalog.categories})
+    print(catalog.get_law_number("日本国憲法", category=2))
+    print(catalog.get_law_number("医薬品の臨床試験", category=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,15 @@
 import codecs
 import json
 from functools import lru_cache
+import itertools
 # from pprint import pprint
-import re
 from xml.etree import ElementTree
-import requests
+from law_cache import DiskCache
+from law_corpus import Corpus
+from law_preprocess import pre_process
+
+# Persistent cache of the API responses, with the shared HTTP transport
+cache = DiskCache()
 
 
 @lru_cache
@@ -22,8 +27,7 @@ def get_raw(number):
         raw (list[str]): raw contents of J-GCP
     """
     url = f"https://elaws.e-gov.go.jp/api/1/lawdata/{number}"
-    r = requests.get(url)
-    root = ElementTree.fromstring(r.content.decode(encoding="utf-8"))
+    root = ElementTree.fromstring(cache.get(url).decode(encoding="utf-8"))
     contents = [e.text.strip() for e in root.iter() if e.text]
     return [t for t in contents if t]
 
@@ -40,20 +44,14 @@ def preprocess_gcp(raw):
 
     Notes:
         - Article 56 will be removed.
-        - Strings enclosed with （ and ） will be removed.
+        - Strings enclosed with （ and ） will be removed, including nested parentheses.
         - 「 and 」 will be removed.
     """
     # contents = raw[:]
-    # Remove article 56
-    contents = raw[: raw.index("第五十六条")]
-    # Select sentenses
-    contents = [s for s in contents if s.endswith("。")]
-    # Join the sentenses
-    gcp = "".join(contents)
-    # 「 and 」 will be removed
-    gcp = gcp.translate(str.maketrans({"「": "", "」": ""}))
-    # Strings enclosed with （ and ） will be removed
-    return re.sub("（[^（|^）]*）", "", gcp)
+    # Remove article 56 (without copying the list)
+    contents = itertools.islice(raw, raw.index("第五十六条"))
+    # Select sentenses, remove 「, 」 and strings enclosed with （ and ）, and join them
+    return pre_process(contents)
 
 
 def main():
@@ -61,6 +59,7 @@ def main():
     # pprint(gcp_raw, compact=False)
     with codecs.open("gcp_raw.json", "w", encoding="utf-8") as fh:
         json.dump({"gcp": gcp_raw}, fh, indent=4, ensure_ascii=False)
+    Corpus.save("gcp_raw.corpus", {"gcp": gcp_raw})
     gcp = preprocess_gcp(gcp_raw)
     # print(gcp)
     with codecs.open("gcp.txt", "w", encoding="utf-8") as fh:
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from array import array
+import codecs
+import json
+import mmap
+import struct
+import sys
+
+
+class Corpus(object):
+    """
+    Read-only corpus of law texts with memory-mapped access.
+
+    Args:
+        filename (str): filename of the corpus created with Corpus.save()
+
+    Raises:
+        ValueError: the file is not a corpus or created with a machine of different byte order
+
+    Notes:
+        File format (offsets are unsigned 64-bit integers in native byte order):
+            - header: magic (8 bytes), byte order (8 bytes), the number of laws and sentences
+            - offsets of the first sentence of each law (the number of laws + 1)
+            - byte offsets of law names in the name blob (the number of laws + 1)
+            - byte offsets of sentences in the text blob (the number of sentences + 1)
+            - name blob and text blob (UTF-8)
+        Opening the corpus does not read the blobs, and names will be decoded at the first lookup with names.
+    """
+    MAGIC = b"LAWCORP1"
+    HEADER = struct.Struct("<8s8sQQ")
+
+    def __init__(self, filename):
+        with open(filename, "rb") as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, byteorder, n_laws, n_sentences) = self.HEADER.unpack_from(self._mmap, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"{filename} is not a corpus file.")
+        if byteorder.rstrip(b"\0").decode() != sys.byteorder:
+            raise ValueError(f"{filename} was created with {byteorder.decode()} endian machine.")
+        self._buffer = memoryview(self._mmap)
+        pos = self.HEADER.size
+        sections = []
+        for size in [n_laws + 1, n_laws + 1, n_sentences + 1]:
+            sections.append(self._buffer[pos: pos + size * 8].cast("Q"))
+            pos += size * 8
+        (self._law_offsets, self._name_offsets, self._text_offsets) = sections
+        self._name_blob = self._buffer[pos: pos + self._name_offsets[-1]]
+        pos += self._name_offsets[-1]
+        self._text_blob = self._buffer[pos: pos + self._text_offsets[-1]]
+        self._n_laws = n_laws
+        self._name_dict = None
+
+    def __len__(self):
+        return self._n_laws
+
+    def __contains__(self, name):
+        return name in self._names()
+
+    def __getitem__(self, law):
+        start, end = self._sentence_range(law)
+        return [self._text(i) for i in range(start, end)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Release the memory-mapped file.
+
+        Raises:
+            BufferError: memoryview objects returned with Corpus.sentence_bytes() have not been released
+        """
+        for view in [self._law_offsets, self._name_offsets, self._text_offsets, self._name_blob, self._text_blob]:
+            view.release()
+        self._buffer.release()
+        self._mmap.close()
+
+    def _names(self):
+        """
+        Return the dictionary of law names and index numbers.
+
+        Returns:
+            dict(str, int): law names (keys) and index numbers (values)
+        """
+        if self._name_dict is None:
+            self._name_dict = {
+                bytes(self._name_blob[self._name_offsets[i]: self._name_offsets[i + 1]]).decode("utf-8"): i
+                for i in range(self._n_laws)}
+        return self._name_dict
+
+    def keys(self):
+        """
+        Return the law names.
+
+        Returns:
+            list[str]: law names in the order of registration
+        """
+        return list(self._names())
+
+    def _sentence_range(self, law):
+        """
+        Return the range of sentence numbers of the law.
+
+        Args:
+            law (str or int): law name or index number of the law
+
+        Raises:
+            KeyError: the law is not included in the corpus
+            TypeError: @law is neither a string nor an integer
+            IndexError: the index number is out of range
+
+        Returns:
+            tuple(int, int): the first sentence number and the last + 1
+        """
+        if isinstance(law, str):
+            if law not in self._names():
+                raise KeyError(f"{law} is not included in the corpus.")
+            law = self._names()[law]
+        if not isinstance(law, int):
+            raise TypeError(f"@law must be a string or integer, but {law} was applied.")
+        if not -self._n_laws <= law < self._n_laws:
+            raise IndexError(f"@law must be under {self._n_laws}, but {law} was applied.")
+        law %= self._n_laws
+        return (self._law_offsets[law], self._law_offsets[law + 1])
+
+    def _text(self, i):
+        """
+        Return the sentence.
+
+        Args:
+            i (int): sentence number in the corpus
+
+        Returns:
+            str: the sentence
+        """
+        return str(self._text_blob[self._text_offsets[i]: self._text_offsets[i + 1]], encoding="utf-8")
+
+    def n_sentences(self, law):
+        """
+        Return the number of sentences of the law.
+
+        Args:
+            law (str or int): law name or index number of the law
+
+        Returns:
+            int: the number of sentences
+        """
+        start, end = self._sentence_range(law)
+        return end - start
+
+    def sentence(self, law, num):
+        """
+        Return a sentence of the law.
+
+        Args:
+            law (str or int): law name or index number of the law
+            num (int): index number of the sentence in the law
+
+        Returns:
+            str: the sentence
+        """
+        return str(self.sentence_bytes(law, num), encoding="utf-8")
+
+    def sentence_bytes(self, law, num):
+        """
+        Return a sentence of the law without copying.
+
+        Args:
+            law (str or int): law name or index number of the law
+            num (int): index number of the sentence in the law
+
+        Raises:
+            IndexError: @num is out of range
+
+        Returns:
+            memoryview: UTF-8 bytes of the sentence, which will be invalid after Corpus.close()
+        """
+        start, end = self._sentence_range(law)
+        if not 0 <= num < end - start:
+            raise IndexError(f"@num must be under {end - start}, but {num} was applied.")
+        return self._text_blob[self._text_offsets[start + num]: self._text_offsets[start + num + 1]]
+
+    @classmethod
+    def save(cls, filename, law_dict):
+        """
+        Save law texts as a corpus file.
+
+        Args:
+            filename (str): filename to save
+            law_dict (dict(str, list[str] or str)): law names (keys) and sentences or a pre-processed string (values)
+        """
+        law_offsets, name_offsets, text_offsets = array("Q", [0]), array("Q", [0]), array("Q", [0])
+        names, texts = [], []
+        for (name, sentences) in law_dict.items():
+            encoded_name = name.encode("utf-8")
+            names.append(encoded_name)
+            name_offsets.append(name_offsets[-1] + len(encoded_name))
+            for sentence in [sentences] if isinstance(sentences, str) else sentences:
+                encoded = sentence.encode("utf-8")
+                texts.append(encoded)
+                text_offsets.append(text_offsets[-1] + len(encoded))
+            law_offsets.append(len(texts))
+        with open(filename, "wb") as fh:
+            fh.write(cls.HEADER.pack(cls.MAGIC, sys.byteorder.encode(), len(names), len(texts)))
+            for offsets in [law_offsets, name_offsets, text_offsets]:
+                offsets.tofile(fh)
+            fh.writelines(names)
+            fh.writelines(texts)
+
+    @classmethod
+    def convert_json(cls, json_filename, filename):
+        """
+        Convert a JSON file of law texts, like law.json and gcp_raw.json, to a corpus file.
+
+        Args:
+            json_filename (str): filename of the JSON file (dict(str, list[str] or str))
+            filename (str): filename of the corpus to save
+        """
+        with codecs.open(json_filename, "r", encoding="utf-8") as fh:
+            cls.save(filename, json.load(fh))
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+from collections import defaultdict
+import threading
+import time
+from aiohttp import web
+from law_all import LawFetchError, LawLoader
+
+
+class StandInServer(object):
+    """
+    Local stand-in of e-Gov API for LawLoader.get_raw_many(), which runs with a thread.
+
+    Args:
+        numbers (list[str]): law numbers to register
+        missing (list[str]): law numbers which will be returned with 404 (not registered in lawlists)
+        flaky (list[str]): law numbers which will be returned with 503 with the first request
+        delay (float): time [sec] to respond to a request of lawdata
+
+    Notes:
+        Start times of the requests and the maximum number of the requests in progress will be recorded.
+    """
+
+    def __init__(self, numbers, missing, flaky, delay=0.05):
+        self.numbers = numbers
+        self.missing = missing
+        self.flaky = flaky
+        self.delay = delay
+        # Start times of the requests of each law
+        self.start_dict = defaultdict(list)
+        self.active = 0
+        self.max_active = 0
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self.url = None
+
+    async def _lawlists(self, request):
+        items = "".join(
+            f"<LawNameListInfo><LawId>{i}</LawId><LawName>確認用の法令{i}</LawName><LawNo>{number}</LawNo>"
+            "<PromulgationDate>20200101</PromulgationDate></LawNameListInfo>"
+            for (i, number) in enumerate(self.numbers))
+        return web.Response(
+            text=f'<?xml version="1.0" encoding="UTF-8"?><DataRoot><ApplData>{items}</ApplData></DataRoot>',
+            content_type="application/xml")
+
+    async def _lawdata(self, request):
+        number = request.match_info["number"]
+        self.start_dict[number].append(time.perf_counter())
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if number in self.missing:
+            raise web.HTTPNotFound()
+        if number in self.flaky and len(self.start_dict[number]) == 1:
+            raise web.HTTPServiceUnavailable()
+        return web.Response(
+            text='<?xml version="1.0" encoding="UTF-8"?><DataRoot><ApplData><LawFullText><Law><LawBody>'
+            f"<LawTitle>{number}</LawTitle></LawBody></Law></LawFullText></ApplData></DataRoot>",
+            content_type="application/xml")
+
+    def __enter__(self):
+        app = web.Application()
+        app.router.add_get("/lawlists/{category}", self._lawlists)
+        app.router.add_get("/lawdata/{number}", self._lawdata)
+        self._loop = asyncio.new_event_loop()
+        self._runner = web.AppRunner(app)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        self._loop.run_until_complete(site.start())
+        (host, port) = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+
+def check_fetch(n_laws=20, concurrency=3, interval=0.05, backoff=0.2, delay=0.3):
+    """
+    Check LawLoader.get_raw_many() with a local stand-in server.
+
+    Args:
+        n_laws (int): the number of laws to retrieve
+        concurrency (int): the maximum number of requests in progress
+        interval (float): minimum interval [sec] between the starts of requests
+        backoff (float): waiting time [sec] before the first retry
+        delay (float): time [sec] to respond to a request, longer than @interval * @concurrency
+
+    Raises:
+        AssertionError: get_raw_many() did not work as expected
+
+    Returns:
+        dict(str, object): the results of the checks
+
+    Notes:
+        The following will be checked.
+            - The number of requests in progress reaches @concurrency, but does not exceed it.
+            - Requests to the host do not start at the same time, with @interval except for fluctuation.
+            - Laws returned with 503 will be retried after @backoff.
+            - Laws returned with 404 will be reported with LawFetchError, but the other laws will be retrieved.
+    """
+    numbers = [f"令和二年確認令第{i}号" for i in range(n_laws)]
+    (missing, flaky) = (numbers[:1], numbers[1:3])
+    with StandInServer(numbers[1:], missing, flaky, delay=delay) as server:
+        loader = LawLoader(api_url=server.url)
+        results = {}
+        try:
+            for (number, raw) in loader.get_raw_many(
+                    numbers, concurrency=concurrency, interval=interval, retries=2, backoff=backoff):
+                results[number] = raw
+        except LawFetchError as e:
+            errors = e.errors
+        else:
+            errors = {}
+    assert sorted(results) == sorted(numbers[1:]), f"Retrieved: {sorted(results)}"
+    assert all(raw == [number] for (number, raw) in results.items()), "Contents were broken."
+    assert list(errors) == missing and errors[missing[0]].status == 404, f"Errors: {errors}"
+    assert server.max_active == concurrency, f"{server.max_active} requests were in progress."
+    starts = sorted(t for times in server.start_dict.values() for t in times)
+    min_interval = min(t2 - t1 for (t1, t2) in zip(starts[:-1], starts[1:]))
+    # Arrivals at the server fluctuate with connection setup and timers of asyncio
+    assert min_interval >= interval / 2, f"Requests started with {min_interval:.3f} sec intervals."
+    waits = [times[1] - times[0] for (number, times) in server.start_dict.items() if number in flaky]
+    assert all(len(server.start_dict[number]) == 2 for number in flaky), "Flaky laws were not retried once."
+    assert min(waits) >= backoff, f"Retries started {min(waits):.3f} sec after the first requests."
+    return {
+        "retrieved": len(results),
+        "errors": {number: str(e) for (number, e) in errors.items()},
+        "max_active": server.max_active,
+        "min_interval": min_interval,
+        "retry_wait": min(waits),
+    }
+
+
+def main():
+    for (key, value) in check_fetch().items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
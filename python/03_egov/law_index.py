@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import codecs
+import hashlib
+import json
+import os
+
+
+class LawIndex(object):
+    """
+    Character n-gram index of law names for keyword search.
+
+    Args:
+        law_dict (dict(str, str)): dictionary of law names (keys) and numbers (values)
+        n (int): the length of n-grams
+
+    Notes:
+        Results of LawIndex.search(keyword) are the same as {k: v for (k, v) in law_dict.items() if keyword in k}.
+    """
+
+    def __init__(self, law_dict, n=2):
+        if not isinstance(n, int):
+            raise TypeError(f"@n must be integer, but {n} was applied.")
+        if n < 1:
+            raise ValueError(f"@n must be over 0, but {n} was applied.")
+        self._n = n
+        self._names = list(law_dict.keys())
+        self._numbers = list(law_dict.values())
+        self.digest = self.calc_digest(law_dict)
+        self._posting_dict = self._build(self._names, n)
+
+    @staticmethod
+    def calc_digest(law_dict):
+        """
+        Return the digest of the dictionary to check whether the index is up-to-date or not.
+
+        Args:
+            law_dict (dict(str, str)): dictionary of law names (keys) and numbers (values)
+
+        Returns:
+            str: SHA-256 digest
+        """
+        string = json.dumps(list(law_dict.items()), ensure_ascii=False)
+        return hashlib.sha256(string.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _build(names, n):
+        """
+        Create posting lists of 1-grams to n-grams.
+
+        Args:
+            names (list[str]): law names
+            n (int): the length of n-grams
+
+        Returns:
+            dict(str, list[int]): n-grams (keys) and sorted index numbers of the names (values)
+        """
+        posting_dict = {}
+        for (i, name) in enumerate(names):
+            grams = {name[j: j + size] for size in range(1, n + 1) for j in range(len(name) - size + 1)}
+            for gram in grams:
+                posting_dict.setdefault(gram, []).append(i)
+        return posting_dict
+
+    def _candidates(self, keyword):
+        """
+        Return index numbers of the names which may include the keyword.
+
+        Args:
+            keyword (str): keyword of the law name
+
+        Returns:
+            list[int] or range: sorted index numbers
+        """
+        if not keyword:
+            return range(len(self._names))
+        size = min(len(keyword), self._n)
+        grams = {keyword[j: j + size] for j in range(len(keyword) - size + 1)}
+        postings = [self._posting_dict.get(gram, []) for gram in grams]
+        return min(postings, key=len)
+
+    def search(self, keyword):
+        """
+        Return the law names which include the keyword and their numbers.
+
+        Args:
+            keyword (str): keyword of the law name
+
+        Returns:
+            dict(str, str): dictionary of law name (key) and law number (value)
+        """
+        if len(keyword) <= self._n:
+            return {self._names[i]: self._numbers[i] for i in self._candidates(keyword)}
+        return {
+            self._names[i]: self._numbers[i] for i in self._candidates(keyword) if keyword in self._names[i]}
+
+    def save(self, filename):
+        """
+        Save the index as a JSON file.
+
+        Args:
+            filename (str): filename to save
+        """
+        index_dict = {
+            "digest": self.digest, "n": self._n, "names": self._names, "numbers": self._numbers,
+            "postings": self._posting_dict,
+        }
+        with codecs.open(filename, "w", encoding="utf-8") as fh:
+            json.dump(index_dict, fh, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, filename, law_dict, n=2):
+        """
+        Load the index from the JSON file, or create and save the index if the file is not up-to-date.
+
+        Args:
+            filename (str): filename of the index
+            law_dict (dict(str, str)): dictionary of law names (keys) and numbers (values)
+            n (int): the length of n-grams
+
+        Returns:
+            LawIndex: the index
+        """
+        if os.path.exists(filename):
+            with codecs.open(filename, "r", encoding="utf-8") as fh:
+                index_dict = json.load(fh)
+            if index_dict["digest"] == cls.calc_digest(law_dict) and index_dict["n"] == n:
+                index = cls.__new__(cls)
+                index._n = n
+                index._names = index_dict["names"]
+                index._numbers = index_dict["numbers"]
+                index.digest = index_dict["digest"]
+                index._posting_dict = index_dict["postings"]
+                return index
+        index = cls(law_dict, n=n)
+        index.save(filename)
+        return index
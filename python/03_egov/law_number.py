@@ -6,7 +6,10 @@ import json
 from functools import lru_cache
 from pprint import pprint
 from xml.etree import ElementTree
-import requests
+from law_cache import DiskCache
+
+# Persistent cache of the API responses, with the shared HTTP transport
+cache = DiskCache()
 
 
 @lru_cache
@@ -22,8 +25,7 @@ def get_law_dict(category=1):
         dict(str, str): dictionary of law names (keys) and numbers (values)
     """
     url = f"https://elaws.e-gov.go.jp/api/1/lawlists/{category}"
-    r = requests.get(url)
-    root = ElementTree.fromstring(r.content.decode(encoding="utf-8"))
+    root = ElementTree.fromstring(cache.get(url).decode(encoding="utf-8"))
     pprint(
         [
             f"{e.tag=}, {e.text=}" for e in root.iter() if e.tag in set(["LawName", "LawNo"])
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from collections import deque
+from xml.etree import ElementTree
+
+
+def _iterparse(source):
+    """
+    Parse XML data incrementally, removing the elements which have been processed.
+
+    Args:
+        source (str or file object): filename or file object of XML data (bytes)
+
+    Yields:
+        tuple(str, xml.etree.ElementTree.Element, xml.etree.ElementTree.Element or None):
+            event ("start" or "end"), the element and its parent
+
+    Notes:
+        The text of an element is available with "start" events of its children and "end" event of itself.
+        Elements will be cleared after "end" events.
+    """
+    stack = []
+    for (event, elem) in ElementTree.iterparse(source, events=("start", "end")):
+        if event == "start":
+            yield (event, elem, stack[-1] if stack else None)
+            stack.append(elem)
+            continue
+        stack.pop()
+        parent = stack[-1] if stack else None
+        yield (event, elem, parent)
+        elem.clear()
+        if parent is not None:
+            parent.remove(elem)
+
+
+def iter_law_list(source):
+    """
+    Parse lawlists data of e-Gov API with a single pass.
+
+    Args:
+        source (str or file object): filename or file object of XML data (bytes)
+
+    Yields:
+        tuple(str, str): law name and law number
+    """
+    names, numbers = deque(), deque()
+    for (event, elem, _) in _iterparse(source):
+        if event != "end":
+            continue
+        if elem.tag == "LawName":
+            names.append(elem.text)
+        elif elem.tag == "LawNo":
+            numbers.append(elem.text)
+        else:
+            continue
+        while names and numbers:
+            yield (names.popleft(), numbers.popleft())
+
+
+def iter_law_info(source):
+    """
+    Parse lawlists data of e-Gov API with a single pass, keeping all information of the laws.
+
+    Args:
+        source (str or file object): filename or file object of XML data (bytes)
+
+    Yields:
+        dict(str, str): tags (keys) and texts (values) of LawNameListInfo elements, like LawId, LawName, LawNo
+    """
+    info_dict = {}
+    for (event, elem, parent) in _iterparse(source):
+        if event != "end":
+            continue
+        if elem.tag == "LawNameListInfo":
+            yield info_dict
+            info_dict = {}
+        elif parent is not None and parent.tag == "LawNameListInfo":
+            info_dict[elem.tag] = elem.text
+
+
+def iter_law_texts(source):
+    """
+    Parse lawdata of e-Gov API with a single pass.
+
+    Args:
+        source (str or file object): filename or file object of XML data (bytes)
+
+    Yields:
+        str: stripped texts of the elements (empty strings will be skipped)
+
+    Notes:
+        The order is the same as that of xml.etree.ElementTree.Element.iter().
+    """
+    # Elements whose text has not been returned
+    pending = set()
+    for (event, elem, parent) in _iterparse(source):
+        if event == "start":
+            # The text of the parent element was fixed before the child element
+            if parent is not None and parent in pending:
+                pending.remove(parent)
+                text = (parent.text or "").strip()
+                if text:
+                    yield text
+            pending.add(elem)
+        elif elem in pending:
+            pending.remove(elem)
+            text = (elem.text or "").strip()
+            if text:
+                yield text
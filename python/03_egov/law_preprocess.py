@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ProcessPoolExecutor
+import re
+
+# 「 and 」 will be removed
+_TRANS_TABLE = str.maketrans({"「": "", "」": ""})
+# （ and ）
+_PAREN_PATTERN = re.compile("[（）]")
+
+
+def pre_process(raw):
+    """
+    Perform pre-processing on raw contents with a single pass.
+
+    Args:
+        raw (iterable[str]): raw contents
+
+    Returns:
+        str: pre-processed string
+
+    Notes:
+        - Only the sentences which end with 。 will be used.
+        - Strings enclosed with （ and ） will be removed, including nested parentheses.
+        - 「 and 」 will be removed.
+        - Unclosed （ and unopened ） will remain.
+    """
+    pieces = []
+    # Positions of （ in @pieces which have not been closed
+    stack = []
+    for sentence in raw:
+        if not sentence.endswith("。"):
+            continue
+        string = sentence.translate(_TRANS_TABLE)
+        pos = 0
+        for match in _PAREN_PATTERN.finditer(string):
+            pieces.append(string[pos: match.start()])
+            pos = match.end()
+            if match.group() == "（":
+                stack.append(len(pieces))
+                pieces.append("（")
+            elif stack:
+                del pieces[stack.pop():]
+            else:
+                pieces.append("）")
+        pieces.append(string[pos:])
+    return "".join(pieces)
+
+
+def pre_process_many(raws, max_workers=None, chunksize=8):
+    """
+    Perform pre-processing on raw contents of many laws with a process pool.
+
+    Args:
+        raws (iterable[list[str]]): raw contents of laws
+        max_workers (int or None): the number of processes, or None (the number of CPUs)
+        chunksize (int): the number of laws sent to a process at once
+
+    Returns:
+        list[str]: pre-processed strings, in the same order as @raws
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(pre_process, raws, chunksize=chunksize))
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import codecs
+from datetime import datetime
+import hashlib
+import json
+import os
+from law_all import LawFetchError, LawLoader
+from law_cache import DiskCache
+
+
+class LawSync(object):
+    """
+    Local mirror of e-Gov laws which will be updated incrementally.
+
+    Args:
+        loader (LawLoader): loader of law data
+        directory (str): directory of the mirror
+
+    Notes:
+        Raw contents of the laws are saved as "{directory}/laws/{filename}.json",
+        and the manifest (law number -> information and revision) is saved as "{directory}/manifest.json".
+        Changes with the last synchronization are saved as "{directory}/changes.json".
+        Because lawlists does not include amendment information, revisions are digests of the contents.
+    """
+    MANIFEST = "manifest.json"
+    CHANGES = "changes.json"
+
+    def __init__(self, loader, directory="mirror"):
+        if not isinstance(loader, LawLoader):
+            raise TypeError(f"@loader must be an instance of LawLoader, but {loader} was applied.")
+        self._loader = loader
+        self._directory = directory
+        self._law_dir = os.path.join(directory, "laws")
+        os.makedirs(self._law_dir, exist_ok=True)
+
+    @staticmethod
+    def _revision(raw):
+        """
+        Return the revision key of the law, which will be changed when the law is amended.
+
+        Args:
+            raw (list[str]): raw contents of the law
+
+        Returns:
+            str: SHA-1 digest of the contents
+        """
+        string = json.dumps(raw, ensure_ascii=False)
+        return hashlib.sha1(string.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _filename(number, info_dict):
+        """
+        Return the filename (without directory) of the law.
+
+        Args:
+            number (str): number of the law
+            info_dict (dict(str, str)): information of the law in lawlists
+
+        Returns:
+            str: LawId or digest of law number with ".json"
+        """
+        law_id = info_dict.get("LawId") or hashlib.sha1(number.encode("utf-8")).hexdigest()
+        return f"{law_id}.json"
+
+    def _read_json(self, filename, default):
+        """
+        Read a JSON file in the directory.
+
+        Args:
+            filename (str): filename in the directory
+            default (object): value to return when the file does not exist
+
+        Returns:
+            object: the loaded value or @default
+        """
+        path = os.path.join(self._directory, filename)
+        if not os.path.exists(path):
+            return default
+        with codecs.open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def _write_json(self, filename, value):
+        """
+        Write a JSON file in the directory, replacing the old file atomically.
+
+        Args:
+            filename (str): filename in the directory
+            value (object): value to save
+        """
+        path = os.path.join(self._directory, filename)
+        with codecs.open(f"{path}.tmp", "w", encoding="utf-8") as fh:
+            json.dump(value, fh, indent=4, ensure_ascii=False)
+        os.replace(f"{path}.tmp", path)
+
+    def manifest(self):
+        """
+        Return the manifest of the mirror.
+
+        Returns:
+            dict(str, dict(str, object)): law numbers (keys) and information with revision keys (values)
+        """
+        return self._read_json(self.MANIFEST, {})
+
+    def load(self, number):
+        """
+        Return the raw contents of the law in the mirror.
+
+        Args:
+            number (str): number of the law
+
+        Raises:
+            KeyError: the law is not included in the mirror
+
+        Returns:
+            list[str]: raw contents of the law
+        """
+        manifest = self.manifest()
+        if number not in manifest:
+            raise KeyError(f"{number} is not included in the mirror.")
+        with codecs.open(os.path.join(self._law_dir, manifest[number]["file"]), "r", encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def sync(self, category=1, concurrency=10, revalidate=True):
+        """
+        Update the mirror, saving only the laws which were added or changed.
+
+        Args:
+            category (int): category number, like 1 (all), 2 (法令), 3 (政令), 4 (省令)
+            concurrency (int): the maximum number of requests at the same time
+            revalidate (bool): whether check amendments of the laws whose information in lawlists was not changed
+
+        Returns:
+            dict(str, object): date of synchronization and the law numbers of "added", "changed", "removed"
+                and "failed" (could not be retrieved)
+
+        Notes:
+            Laws whose information in lawlists was changed will be retrieved again without the cache.
+            When @revalidate is True, the other laws will be revalidated with the cache of the loader
+            (conditional requests after TTL) and their digests will be compared with the manifest.
+            Only the laws saved successfully will be registered in the manifest and the changes.
+            The manifest will be saved even when errors were raised, and the laws which could not be retrieved
+            will be retrieved with the next synchronization.
+        """
+        self._loader.invalidate(category=category)
+        new_dict = {}
+        for info_dict in self._loader.get_law_list(category=category):
+            number = info_dict.get("LawNo")
+            if number:
+                new_dict[number] = {"info": info_dict, "file": self._filename(number, info_dict)}
+        manifest = self.manifest()
+        removed = [number for number in manifest if number not in new_dict]
+        targets = [
+            number for number in new_dict
+            if number not in manifest or manifest[number]["info"] != new_dict[number]["info"]]
+        self._loader.invalidate(numbers=[number for number in targets if number in manifest])
+        if revalidate:
+            kept = [number for number in new_dict if number in manifest and number not in targets]
+            self._loader.revalidate(kept)
+            targets.extend(kept)
+        (added, changed, failed) = ([], [], [])
+        for number in removed:
+            path = os.path.join(self._law_dir, manifest.pop(number)["file"])
+            if os.path.exists(path):
+                os.remove(path)
+        new_files = {law_dict["file"] for law_dict in new_dict.values()}
+        try:
+            for (number, raw) in self._loader.get_raw_many(targets, concurrency=concurrency):
+                law_dict = {**new_dict[number], "revision": self._revision(raw)}
+                if manifest.get(number) == law_dict:
+                    continue
+                with codecs.open(os.path.join(self._law_dir, law_dict["file"]), "w", encoding="utf-8") as fh:
+                    json.dump(raw, fh, ensure_ascii=False)
+                # Remove the old file when the changed law has a new LawId
+                old_file = manifest.get(number, {}).get("file")
+                if old_file is not None and old_file not in new_files:
+                    path = os.path.join(self._law_dir, old_file)
+                    if os.path.exists(path):
+                        os.remove(path)
+                (changed if number in manifest else added).append(number)
+                manifest[number] = law_dict
+        except LawFetchError as e:
+            failed = list(e.errors)
+        finally:
+            change_dict = {
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "added": added, "changed": changed, "removed": removed, "failed": failed,
+            }
+            self._write_json(self.MANIFEST, manifest)
+            self._write_json(self.CHANGES, change_dict)
+        return change_dict
+
+
+def main():
+    loader = LawLoader(category=2, cache=DiskCache())
+    law_sync = LawSync(loader, directory="mirror")
+    change_dict = law_sync.sync(category=2)
+    print({k: v if isinstance(v, str) else len(v) for (k, v) in change_dict.items()})
+
+
+if __name__ == "__main__":
+    main()
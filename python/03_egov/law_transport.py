@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from collections import deque
+import threading
+import time
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class Transport(object):
+    """
+    HTTP transport shared by e-Gov API clients, with connection pools and timing metrics.
+
+    Args:
+        pool_size (int): the maximum number of connections kept for each host
+        timeout (float): timeout [sec] of each request
+        max_records (int): the maximum number of requests kept for metrics
+
+    Notes:
+        Connections will be reused (keep-alive) and gzip will be negotiated with Accept-Encoding header.
+    """
+    HEADERS = {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+
+    def __init__(self, pool_size=10, timeout=60, max_records=10000):
+        if not isinstance(pool_size, int):
+            raise TypeError(f"@pool_size must be integer, but {pool_size} was applied.")
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self._session = None
+        # Threads (e.g. LawCatalog) may access the session at the same time
+        self._lock = threading.Lock()
+        self._records = deque(maxlen=max_records)
+
+    @property
+    def session(self):
+        """
+        requests.Session: pooled session for synchronous requests, which will be created at the first access
+        """
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self._pool_size, pool_maxsize=self._pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(self.HEADERS)
+                self._session = session
+            return self._session
+
+    def close(self):
+        """
+        Close the connections of the synchronous session.
+        """
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def get(self, url, headers=None, stream=False):
+        """
+        Send a GET request with the pooled session.
+
+        Args:
+            url (str): URL to access
+            headers (dict(str, str) or None): additional request headers
+            stream (bool): whether read the response body later or not
+
+        Returns:
+            requests.Response: the response
+
+        Notes:
+            When @stream is True, time to read the response body will not be included in the metrics.
+        """
+        start = time.perf_counter()
+        r = self.session.get(url, headers=headers, stream=stream, timeout=self._timeout)
+        size = None if stream else len(r.content)
+        self.record(url, r.status_code, time.perf_counter() - start, size)
+        return r
+
+    def async_session(self, limit=None):
+        """
+        Create a pooled session for asynchronous requests. This must be called in a running event loop.
+
+        Args:
+            limit (int or None): the maximum number of connections, or None (@pool_size)
+
+        Returns:
+            aiohttp.ClientSession: the session
+        """
+        connector = aiohttp.TCPConnector(limit=limit or self._pool_size, limit_per_host=limit or self._pool_size)
+        return aiohttp.ClientSession(
+            connector=connector, headers=self.HEADERS, timeout=aiohttp.ClientTimeout(total=self._timeout))
+
+    def record(self, url, status, seconds, size=None):
+        """
+        Record a request for metrics.
+
+        Args:
+            url (str): URL to access
+            status (int or None): status code, or None (connection error)
+            seconds (float): time [sec] of the request
+            size (int or None): the size [byte] of the response body, or None (not measured)
+        """
+        self._records.append({"url": url, "status": status, "seconds": seconds, "bytes": size})
+
+    def records(self):
+        """
+        Return the records of the requests.
+
+        Returns:
+            list[dict(str, object)]: records with url, status, seconds and bytes
+        """
+        return list(self._records)
+
+    def metrics(self):
+        """
+        Return the summary of the recorded requests.
+
+        Returns:
+            dict(str, object): the number of requests and errors, total/mean/max seconds and total bytes
+        """
+        seconds = sorted(record["seconds"] for record in self._records)
+        if not seconds:
+            return {
+                "requests": 0, "errors": 0, "total_sec": 0.0,
+                "mean_sec": None, "median_sec": None, "max_sec": None, "bytes": 0,
+            }
+        return {
+            "requests": len(seconds),
+            "errors": sum(1 for record in self._records if record["status"] is None or record["status"] >= 400),
+            "total_sec": sum(seconds),
+            "mean_sec": sum(seconds) / len(seconds),
+            "median_sec": seconds[len(seconds) // 2],
+            "max_sec": seconds[-1],
+            "bytes": sum(record["bytes"] or 0 for record in self._records),
+        }
+
+
+# Transport shared by default
+_default_transport = None
+
+
+def get_transport():
+    """
+    Return the transport shared by default.
+
+    Returns:
+        Transport: the shared transport
+    """
+    global _default_transport
+    if _default_transport is None:
+        _default_transport = Transport()
+    return _default_transport